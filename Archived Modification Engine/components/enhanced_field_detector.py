@@ -6,39 +6,159 @@ engine, using multiple detection methods to ensure all form fields are discovere
 This is separate from the simplified MCP server architecture.
 """
 
+import difflib
+import hashlib
+import importlib.metadata
+import io
+import json
 import logging
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 
+try:
+    from rapidfuzz import fuzz as _rapidfuzz_fuzz
+    from rapidfuzz import process as _rapidfuzz_process
+    from rapidfuzz import utils as _rapidfuzz_utils
+except ImportError:  # optional; difflib is used instead
+    _rapidfuzz_fuzz = _rapidfuzz_process = _rapidfuzz_utils = None
+
+# PDF backends are optional; each detection method is skipped when its library is missing
+try:
+    import fitz as _fitz  # PyMuPDF
+except ImportError:
+    _fitz = None
+
+try:
+    import pypdf as _pypdf
+except ImportError:
+    _pypdf = None
+
+try:
+    from PyPDFForm import PdfWrapper as _PdfWrapper
+except ImportError:
+    _PdfWrapper = None
+
 logger = logging.getLogger(__name__)
 
+# Version of the on-disk detection cache format; bump it whenever
+# FieldDetectionResult.to_dict changes so stale cache files are ignored
+CACHE_FORMAT_VERSION = 2
+
+# Setting this environment variable disables the on-disk detection cache
+NO_CACHE_ENV_VAR = "PDF_ENRICHMENT_NO_CACHE"
+
+
+def _package_version(name: str) -> str:
+    """Get the installed version of a distribution, or "unknown"."""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Installed version of each detection backend, or None when its library is missing.
+# Persisted results are keyed on these, so installing or upgrading a backend
+# never reuses a result it did not contribute to.
+_BACKEND_VERSIONS: Dict[str, Optional[str]] = {
+    "pypdfform": _package_version("PyPDFForm") if _PdfWrapper is not None else None,
+    "pymupdf": _package_version("PyMuPDF") if _fitz is not None else None,
+    "pypdf": _package_version("pypdf") if _pypdf is not None else None,
+}
+_BACKEND_TAG = hashlib.blake2b(
+    json.dumps(_BACKEND_VERSIONS, sort_keys=True).encode(), digest_size=8
+).hexdigest()
+
+
+def default_cache_dir() -> Optional[Path]:
+    """
+    Get the per-user detection cache directory, honouring XDG_CACHE_HOME.
+
+    Returns None when PDF_ENRICHMENT_NO_CACHE is set, which disables the cache.
+    """
+    if os.environ.get(NO_CACHE_ENV_VAR):
+        return None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pdf_enrichment" / "detection"
+
+
+def _intern_names(names) -> List[str]:
+    """Intern field names so every detection method shares one object per name."""
+    return [sys.intern(str(name)) for name in names]
+
 
 class FieldDetectionResult:
     """Result of field detection including fields found and metadata."""
     
+    __slots__ = (
+        "pypdfform_fields",
+        "pymupdf_fields",
+        "pypdf2_fields",
+        "annotation_fields",
+        "all_fields",
+        "field_sources",
+        "detection_errors",
+        "detection_warnings",
+        "normalized_fields",
+        "original_to_normalized",
+        "field_prefixes",
+        "field_types",
+        "radio_groups",
+        "accessible_fields",
+        "_sorted_fields",
+        "_sorted_fields_key",
+    )
+    
     def __init__(self):
         self.pypdfform_fields: List[str] = []
         self.pymupdf_fields: List[str] = []
         self.pypdf2_fields: List[str] = []
         self.annotation_fields: List[str] = []
         self.all_fields: Set[str] = set()
-        self.field_sources: Dict[str, List[str]] = {}
+        self.field_sources: Dict[str, Set[str]] = {}  # field_name -> detection methods
         self.detection_errors: List[str] = []
         self.detection_warnings: List[str] = []
         
         # Enhanced field analysis
         self.normalized_fields: Dict[str, str] = {}  # normalized_name -> original_name
+        self.original_to_normalized: Dict[str, str] = {}  # original_name -> normalized_name
         self.field_prefixes: Dict[str, str] = {}     # field_name -> prefix
         self.field_types: Dict[str, str] = {}        # field_name -> detected_type
         self.radio_groups: Dict[str, List[str]] = {} # group_name -> [individual_options]
         self.accessible_fields: Set[str] = set()     # fields that can be modified
         
+        self._sorted_fields: List[str] = []
+        self._sorted_fields_key: Optional[Tuple[int, int]] = None
+        
     def add_field(self, field_name: str, source: str) -> None:
         """Add a field with its detection source."""
+        field_name = sys.intern(str(field_name))
         self.all_fields.add(field_name)
-        if field_name not in self.field_sources:
-            self.field_sources[field_name] = []
-        self.field_sources[field_name].append(source)
+        self.field_sources.setdefault(field_name, set()).add(source)
+    
+    def add_fields(self, field_names: List[str], source: str) -> None:
+        """Add several fields detected by the same source."""
+        self.all_fields.update(field_names)
+        field_sources = self.field_sources
+        for field_name in field_names:
+            field_sources.setdefault(field_name, set()).add(source)
+        
+    @property
+    def sorted_fields(self) -> List[str]:
+        """
+        All detected field names in sorted order.
+
+        The list is cached and only rebuilt when `all_fields` is replaced or grows,
+        so callers must treat it as read-only.
+        """
+        key = (id(self.all_fields), len(self.all_fields))
+        if key != self._sorted_fields_key:
+            self._sorted_fields = sorted(self.all_fields)
+            self._sorted_fields_key = key
+        return self._sorted_fields
         
     def get_field_count(self) -> int:
         """Get total number of unique fields detected."""
@@ -54,12 +174,58 @@ class FieldDetectionResult:
             "total_unique": len(self.all_fields)
         }
 
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the result to JSON-compatible data for the on-disk cache."""
+        return {
+            "pypdfform_fields": self.pypdfform_fields,
+            "pymupdf_fields": self.pymupdf_fields,
+            "pypdf2_fields": self.pypdf2_fields,
+            "annotation_fields": self.annotation_fields,
+            "all_fields": self.sorted_fields,
+            "field_sources": {name: sorted(sources) for name, sources in self.field_sources.items()},
+            "detection_errors": self.detection_errors,
+            "detection_warnings": self.detection_warnings,
+            "normalized_fields": self.normalized_fields,
+            "original_to_normalized": self.original_to_normalized,
+            "field_prefixes": self.field_prefixes,
+            "field_types": self.field_types,
+            "radio_groups": self.radio_groups,
+            "accessible_fields": sorted(self.accessible_fields),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "FieldDetectionResult":
+        """Rebuild a result previously produced by `to_dict`."""
+        result = cls()
+        result.pypdfform_fields = list(data["pypdfform_fields"])
+        result.pymupdf_fields = list(data["pymupdf_fields"])
+        result.pypdf2_fields = list(data["pypdf2_fields"])
+        result.annotation_fields = list(data["annotation_fields"])
+        result.all_fields = set(data["all_fields"])
+        result.field_sources = {name: set(sources) for name, sources in data["field_sources"].items()}
+        result.detection_errors = list(data["detection_errors"])
+        result.detection_warnings = list(data["detection_warnings"])
+        result.normalized_fields = dict(data["normalized_fields"])
+        result.original_to_normalized = dict(data.get("original_to_normalized", {}))
+        result.field_prefixes = dict(data["field_prefixes"])
+        result.field_types = dict(data["field_types"])
+        result.radio_groups = {group: list(options) for group, options in data["radio_groups"].items()}
+        result.accessible_fields = set(data["accessible_fields"])
+        return result
+
 
 class EnhancedFieldDetector:
     """Enhanced field detection using multiple methods for comprehensive coverage."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
+        # Detection results keyed by SHA-256 of the PDF contents, so renamed copies
+        # hit the cache and rewritten files under the same path miss it
         self.detection_cache: Dict[str, FieldDetectionResult] = {}
+        # (path, size, mtime_ns) -> content hash, to skip re-hashing unchanged files
+        self._hash_cache: Dict[Tuple[str, int, int], str] = {}
+        # Optional directory for persisting complete results across runs, one file per
+        # content hash and set of installed backends
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         
         # Field normalization patterns
         self.field_prefixes = [
@@ -70,6 +236,25 @@ class EnhancedFieldDetector:
             "INSURED.",
             "JOINT_OWNER.",
         ]
+        # Anchored alternation so a single match() replaces the per-prefix startswith loop
+        self._prefix_re = re.compile(
+            "^(" + "|".join(re.escape(prefix) for prefix in self.field_prefixes) + ")"
+        )
+        # Field type rules in priority order. Each branch is a lookahead anchored at
+        # the start, so the first rule that applies anywhere in the name wins and
+        # its (empty) named group reports the type:
+        #   radio group containers, checkbox indicators, signatures (but not their
+        #   date/name companions), dates, payment/dividend options
+        self._type_re = re.compile(
+            r"^(?:"
+            r"(?=.*(?-i:--group)\Z)(?P<radio_group>)"
+            r"|(?=.*(?:_same|check))(?P<checkbox>)"
+            r"|(?=.*signature)(?!.*(?:date|name))(?P<signature>)"
+            r"|(?=.*date)(?P<date>)"
+            r"|(?=.*(?:dividend|payment|billing|option))(?P<option>)"
+            r")",
+            re.IGNORECASE | re.DOTALL,
+        )
         
     def detect_all_fields(self, pdf_path: Path) -> FieldDetectionResult:
         """
@@ -81,30 +266,65 @@ class EnhancedFieldDetector:
         Returns:
             FieldDetectionResult with all detected fields and metadata
         """
-        cache_key = str(pdf_path)
-        if cache_key in self.detection_cache:
-            return self.detection_cache[cache_key]
+        cache_key, pdf_data = self._content_key(pdf_path)
+        if cache_key is not None:
+            if cache_key in self.detection_cache:
+                return self.detection_cache[cache_key]
+            cached_result = self._load_cached_result(cache_key)
+            if cached_result is not None:
+                self.detection_cache[cache_key] = cached_result
+                return cached_result
             
         result = FieldDetectionResult()
         
+        # The bytes read for the content hash are shared by every backend, so the
+        # file is read from disk once; each backend parses them into its own
+        # document, so no parser state is shared between threads.
+        pdf_source = pdf_data if pdf_data is not None else pdf_path
+        
+        # Run the independent detection backends concurrently. Results are merged
+        # in a fixed order to keep field_sources deterministic. Backends whose
+        # library is not installed return immediately, so they are called inline
+        # rather than given a worker thread. Backends raise on parse errors, which
+        # are recorded in detection_errors below.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pypdfform_future = (
+                executor.submit(self._detect_pypdfform_fields, pdf_source)
+                if _PdfWrapper is not None else None
+            )
+            pymupdf_future = (
+                executor.submit(self._detect_pymupdf_all, pdf_source)
+                if _fitz is not None else None
+            )
+            pypdf2_future = (
+                executor.submit(self._detect_pypdf2_fields, pdf_source)
+                if _pypdf is not None else None
+            )
+        
         # Method 1: PyPDFForm (current primary method)
         try:
-            pypdfform_fields = self._detect_pypdfform_fields(pdf_path)
+            pypdfform_fields = (
+                pypdfform_future.result() if pypdfform_future
+                else self._detect_pypdfform_fields(pdf_source)
+            )
             result.pypdfform_fields = pypdfform_fields
-            for field in pypdfform_fields:
-                result.add_field(field, "pypdfform")
+            result.add_fields(pypdfform_fields, "pypdfform")
             logger.info(f"PyPDFForm detected {len(pypdfform_fields)} fields")
         except Exception as e:
             error_msg = f"PyPDFForm detection failed: {e}"
             logger.error(error_msg)
             result.detection_errors.append(error_msg)
             
-        # Method 2: PyMuPDF (fallback method)
+        # Method 2: PyMuPDF (fallback method), scanning widgets and annotations
+        # in a single pass over the document
+        annotation_fields: List[str] = []
         try:
-            pymupdf_fields = self._detect_pymupdf_fields(pdf_path)
+            pymupdf_fields, annotation_fields = (
+                pymupdf_future.result() if pymupdf_future
+                else self._detect_pymupdf_all(pdf_source)
+            )
             result.pymupdf_fields = pymupdf_fields
-            for field in pymupdf_fields:
-                result.add_field(field, "pymupdf")
+            result.add_fields(pymupdf_fields, "pymupdf")
             logger.info(f"PyMuPDF detected {len(pymupdf_fields)} fields")
         except Exception as e:
             error_msg = f"PyMuPDF detection failed: {e}"
@@ -113,159 +333,198 @@ class EnhancedFieldDetector:
             
         # Method 3: pypdf2 (raw PDF dictionary access)
         try:
-            pypdf2_fields = self._detect_pypdf2_fields(pdf_path)
+            pypdf2_fields = (
+                pypdf2_future.result() if pypdf2_future
+                else self._detect_pypdf2_fields(pdf_source)
+            )
             result.pypdf2_fields = pypdf2_fields
-            for field in pypdf2_fields:
-                result.add_field(field, "pypdf2")
+            result.add_fields(pypdf2_fields, "pypdf2")
             logger.info(f"pypdf2 detected {len(pypdf2_fields)} fields")
         except Exception as e:
             error_msg = f"pypdf2 detection failed: {e}"
             logger.error(error_msg)
             result.detection_errors.append(error_msg)
             
-        # Method 4: Annotation-based detection
-        try:
-            annotation_fields = self._detect_annotation_fields(pdf_path)
-            result.annotation_fields = annotation_fields
-            for field in annotation_fields:
-                result.add_field(field, "annotations")
-            logger.info(f"Annotation detection found {len(annotation_fields)} fields")
-        except Exception as e:
-            error_msg = f"Annotation detection failed: {e}"
-            logger.error(error_msg)
-            result.detection_errors.append(error_msg)
+        # Method 4: Annotation-based detection (collected by the PyMuPDF pass)
+        result.annotation_fields = annotation_fields
+        result.add_fields(annotation_fields, "annotations")
+        logger.info(f"Annotation detection found {len(annotation_fields)} fields")
             
         # Enhanced field processing
         self._process_field_normalization(result)
         self._analyze_field_types(result)
         self._detect_radio_groups(result)
-        self._check_field_accessibility(result, pdf_path)
-        
-        # Cache and return result
-        self.detection_cache[cache_key] = result
+        self._check_field_accessibility(result)
+        
+        # Cache and return result. Only persist results every backend contributed
+        # to, so a missing library or a failed parse is retried on the next run.
+        if cache_key is not None:
+            self.detection_cache[cache_key] = result
+            if not result.detection_errors and None not in _BACKEND_VERSIONS.values():
+                self._store_cached_result(cache_key, result)
         logger.info(f"Total unique fields detected: {result.get_field_count()}")
         logger.info(f"Normalized fields: {len(result.normalized_fields)}")
         logger.info(f"Radio groups found: {len(result.radio_groups)}")
         
         return result
     
-    def _detect_pypdfform_fields(self, pdf_path: Path) -> List[str]:
-        """Detect fields using PyPDFForm (current primary method)."""
+    def _content_key(self, pdf_path: Path) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Get the content-hash cache key for a PDF.
+
+        Returns:
+            Tuple of (digest, file bytes). The digest is None if the file can't be
+            read; the bytes are only returned when the file had to be read to hash it.
+        """
+        try:
+            stat = os.stat(pdf_path)
+            stat_key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+            digest = self._hash_cache.get(stat_key)
+            data = None
+            if digest is None:
+                data = Path(pdf_path).read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                self._hash_cache[stat_key] = digest
+            return digest, data
+        except OSError as e:
+            logger.debug(f"Skipping detection cache for {pdf_path}: {e}")
+            return None, None
+
+    def _cache_file(self, cache_key: str) -> Path:
+        """Get the cache file for a content hash in the current format and backend set."""
+        return self.cache_dir / f"v{CACHE_FORMAT_VERSION}-{cache_key}-{_BACKEND_TAG}.json"
+
+    def _load_cached_result(self, cache_key: str) -> Optional[FieldDetectionResult]:
+        """Load a persisted detection result from the cache directory."""
+        if self.cache_dir is None:
+            return None
+        cache_file = self._cache_file(cache_key)
+        if not cache_file.exists():
+            return None
+        try:
+            data = json.loads(cache_file.read_text())
+            if (data.get("format_version") != CACHE_FORMAT_VERSION
+                    or data.get("backends") != _BACKEND_VERSIONS):
+                logger.debug(f"Ignoring detection cache file from another format or backend set: {cache_file}")
+                return None
+            result = FieldDetectionResult.from_dict(data["result"])
+            logger.debug(f"Loaded cached detection result: {cache_file}")
+            return result
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable detection cache file {cache_file}: {e}")
+            return None
+
+    def _store_cached_result(self, cache_key: str, result: FieldDetectionResult) -> None:
+        """Persist a detection result to the cache directory."""
+        if self.cache_dir is None:
+            return
+        data = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "backends": _BACKEND_VERSIONS,
+            "result": result.to_dict(),
+        }
         try:
-            from PyPDFForm import PdfWrapper
-            pdf = PdfWrapper(str(pdf_path))
-            return list(pdf.widgets.keys())
-        except ImportError:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_file(cache_key).write_text(json.dumps(data))
+        except OSError as e:
+            logger.warning(f"Failed to write detection cache for {cache_key}: {e}")
+    
+    def _detect_pypdfform_fields(self, pdf_source: Union[Path, bytes]) -> List[str]:
+        """Detect fields using PyPDFForm (current primary method)."""
+        if _PdfWrapper is None:
             logger.warning("PyPDFForm not available")
             return []
-        except Exception as e:
-            logger.error(f"PyPDFForm field detection error: {e}")
-            return []
+        pdf = _PdfWrapper(pdf_source if isinstance(pdf_source, bytes) else str(pdf_source))
+        return _intern_names(pdf.widgets.keys())
     
-    def _detect_pymupdf_fields(self, pdf_path: Path) -> List[str]:
-        """Detect fields using PyMuPDF."""
+    def _detect_pymupdf_all(self, pdf_source: Union[Path, bytes]) -> Tuple[List[str], List[str]]:
+        """
+        Detect fields using PyMuPDF widgets and page annotations in one pass.
+
+        Returns:
+            Tuple of (widget field names, annotation field names)
+        """
+        if _fitz is None:
+            logger.warning("PyMuPDF not available")
+            return [], []
+        if isinstance(pdf_source, bytes):
+            doc = _fitz.open(stream=pdf_source, filetype="pdf")
+        else:
+            doc = _fitz.open(str(pdf_source))
+        widget_names = []
+        annotation_names = []
+        widget_type = _fitz.PDF_ANNOT_WIDGET
+        
         try:
-            import fitz  # PyMuPDF
-            
-            doc = fitz.open(str(pdf_path))
-            fields = []
-            
             for page_num in range(len(doc)):
                 page = doc[page_num]
                 
                 # Get form fields from page
-                form_fields = page.widgets()
-                for field in form_fields:
-                    field_name = field.field_name
-                    if field_name and field_name not in fields:
-                        fields.append(field_name)
-                        
+                for field in page.widgets():
+                    if field.field_name:
+                        widget_names.append(field.field_name)
+                
+                # Get widget annotations from page. page.annots() never yields
+                # widgets, so read the /T name of each widget annotation's xref
+                for xref, annot_type, *_ in page.annot_xrefs():
+                    if annot_type != widget_type:
+                        continue
+                    value_type, field_name = doc.xref_get_key(xref, "T")
+                    if value_type == "string" and field_name:
+                        annotation_names.append(field_name)
+        finally:
             doc.close()
-            return fields
-            
-        except ImportError:
-            logger.warning("PyMuPDF not available")
-            return []
-        except Exception as e:
-            logger.error(f"PyMuPDF field detection error: {e}")
-            return []
+        
+        return (
+            _intern_names(dict.fromkeys(widget_names)),
+            _intern_names(dict.fromkeys(annotation_names)),
+        )
     
-    def _detect_pypdf2_fields(self, pdf_path: Path) -> List[str]:
+    def _detect_pypdf2_fields(self, pdf_source: Union[Path, bytes]) -> List[str]:
         """Detect fields using pypdf2/PyPDF2 raw dictionary access."""
-        try:
-            import pypdf
-            
-            with open(pdf_path, 'rb') as file:
-                reader = pypdf.PdfReader(file)
-                fields = []
-                
-                # Try to access the form fields from the document root
-                if reader.trailer.get('/Root') and reader.trailer['/Root'].get('/AcroForm'):
-                    acro_form = reader.trailer['/Root']['/AcroForm']
-                    if acro_form.get('/Fields'):
-                        fields_array = acro_form['/Fields']
-                        
-                        for field_ref in fields_array:
-                            field_obj = field_ref.get_object()
-                            field_name = field_obj.get('/T')
-                            if field_name:
-                                field_name_str = str(field_name)
-                                # Clean up field name (remove parentheses and quotes)
-                                field_name_str = field_name_str.strip('()')
-                                if field_name_str not in fields:
-                                    fields.append(field_name_str)
-                                    
-                                # Also check for child fields
-                                if field_obj.get('/Kids'):
-                                    kids = field_obj['/Kids']
-                                    for kid_ref in kids:
-                                        kid_obj = kid_ref.get_object()
-                                        kid_name = kid_obj.get('/T')
-                                        if kid_name:
-                                            kid_name_str = str(kid_name).strip('()')
-                                            full_name = f"{field_name_str}.{kid_name_str}"
-                                            if full_name not in fields:
-                                                fields.append(full_name)
-                
-                return fields
-                
-        except ImportError:
+        if _pypdf is None:
             logger.warning("pypdf not available")
             return []
-        except Exception as e:
-            logger.error(f"pypdf2 field detection error: {e}")
-            return []
-    
-    def _detect_annotation_fields(self, pdf_path: Path) -> List[str]:
-        """Detect fields from page annotations."""
-        try:
-            import fitz  # PyMuPDF for annotation access
-            
-            doc = fitz.open(str(pdf_path))
-            fields = []
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
+        reader = _pypdf.PdfReader(
+            io.BytesIO(pdf_source) if isinstance(pdf_source, bytes) else str(pdf_source)
+        )
+        fields: Dict[str, None] = {}  # insertion-ordered set
+        
+        # Try to access the form fields from the document root
+        if reader.trailer.get('/Root') and reader.trailer['/Root'].get('/AcroForm'):
+            acro_form = reader.trailer['/Root']['/AcroForm']
+            if acro_form.get('/Fields'):
+                # Walk the whole field tree depth-first, building fully
+                # qualified "parent.child" names and resolving each
+                # indirect object only once
+                stack = [(None, ref) for ref in reversed(acro_form['/Fields'])]
+                seen_refs = set()
                 
-                # Get annotations from page
-                annotations = page.annots()
-                for annot in annotations:
-                    # Check if annotation is a form field
-                    annot_dict = annot.info
-                    if annot_dict.get("type") == "Widget":
-                        field_name = annot_dict.get("title") or annot_dict.get("name")
-                        if field_name and field_name not in fields:
-                            fields.append(field_name)
-                            
-            doc.close()
-            return fields
-            
-        except ImportError:
-            logger.warning("PyMuPDF not available for annotation detection")
-            return []
-        except Exception as e:
-            logger.error(f"Annotation field detection error: {e}")
-            return []
+                while stack:
+                    parent_name, field_ref = stack.pop()
+                    idnum = getattr(field_ref, 'idnum', None)
+                    if idnum is not None:
+                        ref_key = (idnum, field_ref.generation)
+                        if ref_key in seen_refs:
+                            continue
+                        seen_refs.add(ref_key)
+                    
+                    field_obj = field_ref.get_object()
+                    field_name = field_obj.get('/T')
+                    # Clean up field name (remove parentheses and quotes)
+                    name = str(field_name).strip('()') if field_name else None
+                    if parent_name and name:
+                        full_name = f"{parent_name}.{name}"
+                    else:
+                        full_name = name or parent_name
+                    
+                    if full_name:
+                        fields[full_name] = None
+                    
+                    kids = field_obj.get('/Kids') or ()
+                    stack.extend((full_name, kid_ref) for kid_ref in reversed(kids))
+        
+        return _intern_names(fields)
     
     def generate_field_report(self, result: FieldDetectionResult) -> str:
         """Generate a comprehensive field detection report."""
@@ -284,30 +543,21 @@ class EnhancedFieldDetector:
         report_lines.append(f"- **Total unique fields**: {summary['total_unique']}")
         report_lines.append("")
         
-        # Fields by detection method
-        if result.pypdfform_fields:
-            report_lines.append("## PyPDFForm Fields")
-            for field in sorted(result.pypdfform_fields):
-                report_lines.append(f"- {field}")
-            report_lines.append("")
-        
-        if result.pymupdf_fields:
-            report_lines.append("## PyMuPDF Fields")
-            for field in sorted(result.pymupdf_fields):
-                report_lines.append(f"- {field}")
-            report_lines.append("")
-        
-        if result.pypdf2_fields:
-            report_lines.append("## pypdf2 Fields")
-            for field in sorted(result.pypdf2_fields):
-                report_lines.append(f"- {field}")
-            report_lines.append("")
-        
-        if result.annotation_fields:
-            report_lines.append("## Annotation Fields")
-            for field in sorted(result.annotation_fields):
-                report_lines.append(f"- {field}")
-            report_lines.append("")
+        # Fields by detection method; every source list is a subset of all_fields,
+        # so sort once and filter in that order
+        sorted_fields = result.sorted_fields
+        method_sections = [
+            ("PyPDFForm Fields", result.pypdfform_fields),
+            ("PyMuPDF Fields", result.pymupdf_fields),
+            ("pypdf2 Fields", result.pypdf2_fields),
+            ("Annotation Fields", result.annotation_fields),
+        ]
+        for title, method_fields in method_sections:
+            if method_fields:
+                method_set = set(method_fields)
+                report_lines.append(f"## {title}")
+                report_lines.extend(f"- {field}" for field in sorted_fields if field in method_set)
+                report_lines.append("")
         
         # Field normalization analysis
         if result.field_prefixes:
@@ -337,10 +587,13 @@ class EnhancedFieldDetector:
             
             inaccessible_fields = result.all_fields - result.accessible_fields
             if inaccessible_fields:
+                get_type = result.field_types.get
                 report_lines.append("### Inaccessible Fields")
-                for field in sorted(inaccessible_fields):
-                    field_type = result.field_types.get(field, "unknown")
-                    report_lines.append(f"- **{field}** (type: {field_type})")
+                report_lines.extend(
+                    f"- **{field}** (type: {get_type(field, 'unknown')})"
+                    for field in sorted_fields
+                    if field in inaccessible_fields
+                )
                 report_lines.append("")
         
         # Field types summary
@@ -356,11 +609,14 @@ class EnhancedFieldDetector:
         
         # Field sources
         report_lines.append("## Field Detection Sources")
-        for field in sorted(result.all_fields):
-            sources = ", ".join(result.field_sources[field])
-            field_type = result.field_types.get(field, "unknown")
-            accessible = "✅" if field in result.accessible_fields else "❌"
-            report_lines.append(f"- **{field}** ({field_type}) {accessible}: {sources}")
+        get_type = result.field_types.get
+        is_accessible = result.accessible_fields.__contains__
+        field_sources = result.field_sources
+        report_lines.extend(
+            f"- **{field}** ({get_type(field, 'unknown')}) "
+            f"{'✅' if is_accessible(field) else '❌'}: {', '.join(sorted(field_sources[field]))}"
+            for field in sorted_fields
+        )
         report_lines.append("")
         
         # Errors and warnings
@@ -394,50 +650,33 @@ class EnhancedFieldDetector:
         missing_fields = expected_fields - detected_fields
         suggestions = {}
         
+        if _rapidfuzz_process is not None:
+            choices = list(detected_fields)
+            for missing_field in missing_fields:
+                matches = _rapidfuzz_process.extract(
+                    missing_field,
+                    choices,
+                    scorer=_rapidfuzz_fuzz.WRatio,
+                    processor=_rapidfuzz_utils.default_process,
+                    limit=3,
+                    score_cutoff=30,
+                )
+                suggestions[missing_field] = [field for field, _, _ in matches]
+            return suggestions
+        
+        # Fallback: difflib ratio on case-folded names
+        lowered = {field.lower(): field for field in detected_fields}
         for missing_field in missing_fields:
-            # Find similar fields using string similarity
-            similar_fields = []
-            for detected_field in detected_fields:
-                similarity = self._calculate_similarity(missing_field, detected_field)
-                if similarity > 0.3:  # Threshold for similarity
-                    similar_fields.append((detected_field, similarity))
-            
-            # Sort by similarity score
-            similar_fields.sort(key=lambda x: x[1], reverse=True)
-            suggestions[missing_field] = [field for field, _ in similar_fields[:3]]
+            matches = difflib.get_close_matches(missing_field.lower(), lowered, n=3, cutoff=0.3)
+            suggestions[missing_field] = [lowered[match] for match in matches]
         
         return suggestions
     
-    def _calculate_similarity(self, str1: str, str2: str) -> float:
-        """Calculate similarity between two strings."""
-        # Simple character-based similarity
-        str1_lower = str1.lower()
-        str2_lower = str2.lower()
-        
-        # Calculate Jaccard similarity
-        set1 = set(str1_lower)
-        set2 = set(str2_lower)
-        
-        if not set1 or not set2:
-            return 0.0
-            
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-        
-        return intersection / union if union > 0 else 0.0
-    
     def _process_field_normalization(self, result: FieldDetectionResult) -> None:
         """Process field name normalization to handle prefixes."""
         for field_name in result.all_fields:
-            normalized_name = field_name
-            prefix = ""
-            
-            # Check for known prefixes
-            for prefix_pattern in self.field_prefixes:
-                if field_name.startswith(prefix_pattern):
-                    prefix = prefix_pattern
-                    normalized_name = field_name[len(prefix_pattern):]
-                    break
+            prefix, normalized_name = self._strip_prefix(field_name)
+            result.original_to_normalized[field_name] = normalized_name
             
             # Store normalization info
             if prefix:
@@ -447,6 +686,13 @@ class EnhancedFieldDetector:
             else:
                 result.normalized_fields[field_name] = field_name
     
+    def _strip_prefix(self, field_name: str) -> Tuple[str, str]:
+        """Split a field name into its known prefix ("" if none) and the remainder."""
+        match = self._prefix_re.match(field_name)
+        if match:
+            return match.group(1), field_name[match.end():]
+        return "", field_name
+    
     def _analyze_field_types(self, result: FieldDetectionResult) -> None:
         """Analyze and categorize field types."""
         for field_name in result.all_fields:
@@ -455,49 +701,50 @@ class EnhancedFieldDetector:
             
     def _determine_field_type(self, field_name: str) -> str:
         """Determine field type based on field name patterns."""
-        field_lower = field_name.lower()
-        
-        # Radio group containers
-        if field_name.endswith("--group"):
-            return "radio_group"
-        
-        # Checkbox indicators
-        if any(indicator in field_lower for indicator in ["_same", "addr_same", "check"]):
-            return "checkbox"
-        
-        # Signature fields
-        if "signature" in field_lower and "date" not in field_lower and "name" not in field_lower:
-            return "signature"
-        
-        # Date fields
-        if "date" in field_lower or field_name.endswith("_DATE"):
-            return "date"
-        
-        # Payment/dividend options (likely checkboxes or radio buttons)
-        if any(keyword in field_lower for keyword in ["dividend", "payment", "billing", "option"]):
-            return "option"
-        
-        # Default to text field
-        return "text"
+        match = self._type_re.match(field_name)
+        return match.lastgroup if match else "text"
     
     def _detect_radio_groups(self, result: FieldDetectionResult) -> None:
         """Detect radio groups and their individual options."""
-        # Find radio group containers
-        group_containers = [field for field in result.all_fields if field.endswith("--group")]
+        # Single pass: collect radio group containers and build a prefix trie of
+        # the individual (non-group) field names. Complete names are stored under
+        # the None key, which can't collide with a character of a name.
+        group_containers = []
+        trie: Dict[Optional[str], dict] = {}
+        for field_name in result.all_fields:
+            if field_name.endswith("--group"):
+                group_containers.append(field_name)
+                continue
+            node = trie
+            for char in field_name:
+                node = node.setdefault(char, {})
+            node[None] = field_name
         
         for group_container in group_containers:
             group_base = group_container.replace("--group", "")
-            individual_options = []
             
-            # Look for related individual fields
-            for field_name in result.all_fields:
-                if field_name != group_container and group_base in field_name:
-                    # Check if it's an individual option (not another group)
-                    if not field_name.endswith("--group"):
-                        individual_options.append(field_name)
+            # Descend to the node for the group base, then collect every field below it
+            node = trie
+            for char in group_base:
+                node = node.get(char)
+                if node is None:
+                    break
+            if not node:
+                continue
+            
+            individual_options = []
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                for key, child in current.items():
+                    if key is None:
+                        individual_options.append(child)
+                    else:
+                        stack.append(child)
             
             # Store radio group info
             if individual_options:
+                individual_options.sort()
                 result.radio_groups[group_container] = individual_options
                 logger.debug(f"Radio group '{group_container}' has options: {individual_options}")
             
@@ -528,25 +775,21 @@ class EnhancedFieldDetector:
             if potential_options:
                 logger.info(f"Potential dividend option fields: {potential_options}")
     
-    def _check_field_accessibility(self, result: FieldDetectionResult, pdf_path: Path) -> None:
-        """Check which fields are accessible for modification."""
-        # Fields accessible through PyPDFForm are definitely modifiable
-        result.accessible_fields.update(result.pypdfform_fields)
-        
-        # Check if normalized fields from other detection methods match PyPDFForm fields
-        pypdfform_set = set(result.pypdfform_fields)
+    def _check_field_accessibility(self, result: FieldDetectionResult) -> None:
+        """
+        Check which fields are accessible for modification.
         
-        for field_name in result.all_fields:
-            if field_name not in pypdfform_set:
-                # Check if the normalized version exists in PyPDFForm
-                normalized_name = field_name
-                for prefix_pattern in self.field_prefixes:
-                    if field_name.startswith(prefix_pattern):
-                        normalized_name = field_name[len(prefix_pattern):]
-                        break
-                
-                if normalized_name in pypdfform_set:
-                    result.accessible_fields.add(field_name)
-                    logger.debug(f"Field '{field_name}' accessible via normalized name '{normalized_name}'")
+        Accessibility is inferred from which detection methods reported each field;
+        the PDF itself is not reopened.
+        """
+        # Fields accessible through PyPDFForm are definitely modifiable, as are fields
+        # from other detection methods whose normalized name PyPDFForm knows
+        pypdfform_set = frozenset(result.pypdfform_fields)
+        accessible_via_normalized = {
+            original
+            for original, normalized in result.original_to_normalized.items()
+            if normalized in pypdfform_set
+        }
+        result.accessible_fields |= pypdfform_set | accessible_via_normalized
         
         logger.info(f"Accessible fields: {len(result.accessible_fields)} out of {len(result.all_fields)}")
\ No newline at end of file
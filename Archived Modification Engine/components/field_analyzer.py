@@ -4,13 +4,22 @@ PDF Form Field Analyzer
 Extracts form field information from PDF files for Claude Desktop processing.
 """
 
+import hashlib
 import logging
+import os
 import re
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from PyPDFForm import PdfWrapper
 
+try:
+    import numpy as np
+except ImportError:  # optional; position grouping falls back to pure Python
+    np = None
+
 from .field_types import (
     FieldPosition,
     FieldType,
@@ -19,12 +28,99 @@ from .field_types import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of PDFs whose extracted fields are kept in memory
+_FIELD_CACHE_SIZE = 64
+# Read size used when hashing PDFs for the field cache
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Field name cleanup patterns
+_WIDGET_PREFIX_RE = re.compile(r'^(Text|Checkbox|Radio|Dropdown|Signature)_?')
+_WIDGET_SUFFIX_RE = re.compile(r'_?(Field|Box|Button)$')
+# Word separators in field names, mapped to spaces
+_SEPARATOR_TABLE = str.maketrans('_-', '  ')
+
+# Maximum vertical distance (in points) between radio buttons in the same row group
+_ROW_Y_THRESHOLD = 50
+# Below this many fields per page, NumPy dispatch costs more than it saves
+_NUMPY_MIN_FIELDS = 8
+
+# Weights for the widget type, field name, properties and attribute signals
+_SIGNAL_WEIGHTS = (1.0, 0.6, 0.8, 0.7)
+# Field types in a fixed order, for index-based score accumulation
+_FIELD_TYPES = tuple(FieldType)
+_FIELD_TYPE_INDEX = {field_type: i for i, field_type in enumerate(_FIELD_TYPES)}
+
+# Map PyPDFForm widget class names to our FieldType enum with confidence
+_WIDGET_NAME_SIGNALS = {
+    "Text": (FieldType.TEXT_FIELD, 0.9),
+    "Checkbox": (FieldType.CHECKBOX, 0.9),
+    "Radio": (FieldType.RADIO_BUTTON, 0.9),
+    "Dropdown": (FieldType.DROPDOWN, 0.9),
+    "Signature": (FieldType.SIGNATURE, 0.9),
+    "Button": (FieldType.BUTTON, 0.9),
+    "ListBox": (FieldType.LISTBOX, 0.9),
+}
+# Widget class -> signal, filled on first sight of each class. The class names are
+# resolved lazily because PyPDFForm's widget module layout varies between releases.
+_WIDGET_CLASS_SIGNALS: Dict[type, Tuple[FieldType, float]] = {}
+
+# Type-specific widget attributes in priority order: buttons, signatures, radio
+# grouping, checkboxes, text formatting
+_WIDGET_ATTRIBUTE_SIGNALS = (
+    (('action', 'onclick'), (FieldType.BUTTON, 0.7)),
+    (('signature_type', 'ink'), (FieldType.SIGNATURE, 0.8)),
+    (('group', 'radio_group'), (FieldType.RADIO_BUTTON, 0.7)),
+    (('checked', 'check_state'), (FieldType.CHECKBOX, 0.7)),
+    (('text_align', 'font_size'), (FieldType.TEXT_FIELD, 0.6)),
+)
+
+# Field name signals in priority order: signature, date, checkbox, radio button,
+# dropdown. Each branch is a lookahead anchored at the start, so the first category
+# with a keyword anywhere in the (lowercased) name wins.
+_NAME_SIGNAL_RE = re.compile(
+    r'^(?:'
+    r'(?=.*(?:signature|sign|autograph|signed))(?P<signature>)'
+    r'|(?=.*(?:date|day|month|year|time|timestamp))(?P<date>)'
+    r'|(?=.*(?:check|box|option|select|yes|no|agree|consent))(?P<checkbox>)'
+    r'|(?=.*(?:radio|choice|group|option))(?P<radio>)'
+    r'|(?=.*(?:dropdown|select|list|menu|combo))(?P<dropdown>)'
+    r')',
+    re.DOTALL,
+)
+_NAME_SIGNALS = {
+    'signature': (FieldType.SIGNATURE, 0.8),
+    'date': (FieldType.TEXT_FIELD, 0.7),  # Dates are typically text fields
+    'checkbox': (FieldType.CHECKBOX, 0.6),
+    'radio': (FieldType.RADIO_BUTTON, 0.6),
+    'dropdown': (FieldType.DROPDOWN, 0.6),
+}
+
+# Common naming patterns for radio groups, tried in order as one alternation:
+#   base_name_1, base_name_2, ...
+#   base_name_option1, base_name_option2, ...
+#   prefix_category_suffix
+#   category_1, category_2, ...
+# The named group of the first alternative that matches holds the group base name.
+_RADIO_NAME_RE = re.compile(
+    r'^(?:'
+    r'(?P<numbered>.+?)_\d+'
+    r'|(?P<option>.+?)_?(?:option|choice|item)_?\d+'
+    r'|(?P<suffixed>.+?)_[a-zA-Z]+'
+    r'|(?P<counted>[a-zA-Z_]+?)\d+'
+    r')$',
+    re.IGNORECASE,
+)
+
 
 class FieldAnalyzer:
     """Extracts form field information from PDF files."""
 
     def __init__(self) -> None:
-        self.field_cache: Dict[str, List[FormField]] = {}
+        # LRU of extracted fields keyed by SHA-256 of the PDF contents, so the same
+        # blank template is parsed once and regenerated files are never served stale
+        self.field_cache: "OrderedDict[str, List[FormField]]" = OrderedDict()
+        # (path, size, mtime_ns) -> content hash, to skip re-hashing unchanged files
+        self._hash_cache: Dict[Tuple[str, int, int], str] = {}
 
     async def extract_form_fields(self, pdf_path: Path) -> List[FormField]:
         """
@@ -38,8 +134,10 @@ class FieldAnalyzer:
         """
         try:
             # Check cache first
-            cache_key = str(pdf_path)
+            cache_key = self._cache_key(pdf_path)
             if cache_key in self.field_cache:
+                logger.debug("template cache hit")
+                self.field_cache.move_to_end(cache_key)
                 return self.field_cache[cache_key]
 
             # Load PDF with PyPDFForm
@@ -81,10 +179,12 @@ class FieldAnalyzer:
                     logger.error(f"Unexpected error processing field {field_name}: {e}")
                     continue
 
-            # Cache result
+            # Cache result, evicting the least recently used PDF
             self.field_cache[cache_key] = form_fields
+            if len(self.field_cache) > _FIELD_CACHE_SIZE:
+                self.field_cache.popitem(last=False)
 
-            logger.info(f"Extracted {len(form_fields)} fields from {pdf_path}")
+            logger.info("Extracted %d fields from %s", len(form_fields), pdf_path)
             return form_fields
 
         except FileNotFoundError as e:
@@ -97,6 +197,25 @@ class FieldAnalyzer:
             logger.exception(f"Error extracting fields from {pdf_path}")
             raise RuntimeError(f"Failed to extract form fields: {e!s}") from e
 
+    def _cache_key(self, pdf_path: Path) -> str:
+        """Return the content hash of a PDF, or its path if it cannot be read."""
+        path_str = str(pdf_path)
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return path_str
+
+        stat_key = (path_str, stat.st_size, stat.st_mtime_ns)
+        digest = self._hash_cache.get(stat_key)
+        if digest is None:
+            sha256 = hashlib.sha256()
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+            digest = sha256.hexdigest()
+            self._hash_cache[stat_key] = digest
+        return digest
+
     def _safe_get_bool_attr(self, widget: any, attr_name: str, default: bool) -> bool:
         """Safely get boolean attribute from widget, handling None values."""
         value = getattr(widget, attr_name, default)
@@ -148,20 +267,43 @@ class FieldAnalyzer:
         # Fall back to cleaning up the field name
         return self._clean_field_name(field_name)
 
-    def _clean_field_name(self, field_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_field_name(field_name: str) -> str:
         """Clean up field name to create a human-readable label."""
         # Remove common prefixes and suffixes
-        cleaned = re.sub(r'^(Text|Checkbox|Radio|Dropdown|Signature)_?', '', field_name)
-        cleaned = re.sub(r'_?(Field|Box|Button)$', '', cleaned)
-
-        # Replace underscores and camelCase with spaces
-        cleaned = re.sub(r'([a-z])([A-Z])', r'\1 \2', cleaned)
-        cleaned = re.sub(r'[_-]', ' ', cleaned)
-
-        # Capitalize words
-        cleaned = ' '.join(word.capitalize() for word in cleaned.split())
-
-        return cleaned or field_name
+        cleaned = _WIDGET_PREFIX_RE.sub('', field_name)
+        cleaned = _WIDGET_SUFFIX_RE.sub('', cleaned)
+
+        # Without uppercase letters there are no camelCase breaks, so separators
+        # can be translated to spaces directly
+        if cleaned.islower():
+            words = cleaned.translate(_SEPARATOR_TABLE).split()
+            return ' '.join(word.capitalize() for word in words) or field_name
+
+        # Single pass: split on whitespace, underscores, hyphens and lower->Upper
+        # camelCase boundaries. Each word is capitalized whole so context-dependent
+        # lowercasing (e.g. Greek final sigma) matches str.capitalize.
+        words = []
+        start = None
+        prev_lower = False
+        for i, ch in enumerate(cleaned):
+            if ch in '_-' or ch.isspace():
+                if start is not None:
+                    words.append(cleaned[start:i])
+                    start = None
+                prev_lower = False
+                continue
+            if start is None:
+                start = i
+            elif prev_lower and 'A' <= ch <= 'Z':
+                words.append(cleaned[start:i])
+                start = i
+            prev_lower = 'a' <= ch <= 'z'
+        if start is not None:
+            words.append(cleaned[start:])
+
+        return ' '.join(word.capitalize() for word in words) or field_name
 
     def detect_radio_groups(self, form_fields: List[FormField]) -> Dict[str, List[str]]:
         """Detect radio groups using multi-strategy approach."""
@@ -175,6 +317,26 @@ class RadioGroupDetector:
     def __init__(self):
         self.logger = logging.getLogger(__name__ + ".RadioGroupDetector")
 
+        # Common radio group categories
+        category_patterns = {
+            'gender': ['male', 'female', 'other', 'm', 'f'],
+            'payment_method': ['ach', 'check', 'wire', 'credit', 'debit', 'cash'],
+            'frequency': ['monthly', 'quarterly', 'annual', 'weekly', 'daily'],
+            'yes_no': ['yes', 'no', 'y', 'n', 'true', 'false'],
+            'dividend': ['cash', 'reduce', 'accumulate', 'paid'],
+            'withdrawal': ['systematic', 'lump', 'partial', 'full'],
+            'marital_status': ['single', 'married', 'divorced', 'widowed'],
+            'employment': ['employed', 'retired', 'unemployed', 'student']
+        }
+        # One alternation per category, matched as whole words. Underscores count as
+        # separators so "gender_m" matches 'm' while "note" no longer matches 'no'.
+        self._category_res = {
+            category: re.compile(
+                r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, keywords)) + r')(?![a-z0-9])'
+            )
+            for category, keywords in category_patterns.items()
+        }
+
     def detect_radio_groups(self, form_fields: List[FormField]) -> Dict[str, List[str]]:
         """Enhanced radio group detection with multiple strategies."""
 
@@ -185,13 +347,22 @@ class RadioGroupDetector:
             self.logger.info("No radio button fields found")
             return {}
 
-        self.logger.info(f"Analyzing {len(radio_fields)} radio button fields for grouping")
+        self.logger.info("Analyzing %d radio button fields for grouping", len(radio_fields))
 
         # Strategy 1: Name pattern matching
         groups_by_pattern = self._detect_by_naming_pattern(radio_fields)
 
+        # When naming patterns already group every radio, position and label
+        # groups would all conflict with them and be dropped by the merge
+        pattern_grouped = set().union(*groups_by_pattern.values())
+        if all(field.name in pattern_grouped for field in radio_fields):
+            self.logger.info("Detected %d radio groups", len(groups_by_pattern))
+            return groups_by_pattern
+
         # Strategy 2: Visual positioning
-        groups_by_position = self._detect_by_position(radio_fields)
+        groups_by_position = self._detect_by_position(
+            radio_fields, self._position_arrays(radio_fields)
+        )
 
         # Strategy 3: Field type analysis (already filtered to radio buttons)
         groups_by_labels = self._detect_by_labels(radio_fields)
@@ -201,46 +372,52 @@ class RadioGroupDetector:
             groups_by_pattern, groups_by_position, groups_by_labels
         )
 
-        self.logger.info(f"Detected {len(combined_groups)} radio groups")
+        self.logger.info("Detected %d radio groups", len(combined_groups))
         return combined_groups
 
     def _detect_by_naming_pattern(self, radio_fields: List[FormField]) -> Dict[str, List[str]]:
         """Detect radio groups by naming patterns."""
-        groups = {}
+        # base name -> insertion-ordered set of option names
+        groups = defaultdict(dict)
 
-        # Common naming patterns for radio groups
-        patterns = [
-            # Pattern: base_name_1, base_name_2, etc.
-            r'^(.+?)_(\d+)$',
-            # Pattern: base_name_option1, base_name_option2, etc.
-            r'^(.+?)_?(option|choice|item)_?(\d+)$',
-            # Pattern: prefix_category_suffix
-            r'^(.+?)_([a-zA-Z]+)$',
-            # Pattern: category_1, category_2, etc.
-            r'^([a-zA-Z_]+?)(\d+)$'
-        ]
-
-        for pattern in patterns:
-            for field in radio_fields:
-                match = re.match(pattern, field.name, re.IGNORECASE)
-                if match:
-                    base_name = match.group(1).lower().strip('_')
-                    option_name = field.name
-
-                    if base_name not in groups:
-                        groups[base_name] = []
-
-                    if option_name not in groups[base_name]:
-                        groups[base_name].append(option_name)
+        for field in radio_fields:
+            option_name = field.name
+            match = _RADIO_NAME_RE.match(option_name)
+            if match:
+                base_name = match.group(match.lastgroup).lower().strip('_')
+                groups[base_name][option_name] = None
 
         # Filter out groups with only one item
-        groups = {k: v for k, v in groups.items() if len(v) > 1}
+        groups = {k: list(v) for k, v in groups.items() if len(v) > 1}
 
-        self.logger.debug(f"Pattern detection found {len(groups)} groups")
+        self.logger.debug("Pattern detection found %d groups", len(groups))
         return groups
 
-    def _detect_by_position(self, radio_fields: List[FormField]) -> Dict[str, List[str]]:
+    def _position_arrays(self, radio_fields: List[FormField]) -> Optional[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]]:
+        """
+        Extract (pages, xs, ys) arrays for the fields in one pass, or None when
+        NumPy is unavailable or there are too few fields for it to pay off.
+        """
+        n = len(radio_fields)
+        if np is None or n < _NUMPY_MIN_FIELDS:
+            return None
+
+        positions = [field.position for field in radio_fields]
+        pages = np.fromiter((p.page for p in positions), dtype=np.int32, count=n)
+        xs = np.fromiter((p.x for p in positions), dtype=np.float64, count=n)
+        ys = np.fromiter((p.y for p in positions), dtype=np.float64, count=n)
+        return pages, xs, ys
+
+    def _detect_by_position(self,
+                            radio_fields: List[FormField],
+                            positions: Optional[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = None,
+                            ) -> Dict[str, List[str]]:
         """Detect radio groups by visual positioning."""
+        if positions is not None:
+            groups = self._detect_by_position_arrays(radio_fields, *positions)
+            self.logger.debug("Position detection found %d groups", len(groups))
+            return groups
+
         groups = {}
 
         # Group fields by page and proximity
@@ -253,68 +430,80 @@ class RadioGroupDetector:
 
         group_id = 0
         for page, fields in page_groups.items():
-            # Sort fields by position (top to bottom, left to right)
-            fields.sort(key=lambda f: (f.position.y, f.position.x))
-
-            # Group fields that are close to each other
-            current_group = []
-            last_y = None
-            y_threshold = 50  # pixels
-
-            for field in fields:
-                if last_y is None or abs(field.position.y - last_y) <= y_threshold:
-                    current_group.append(field)
-                else:
-                    # Start new group if far apart
-                    if len(current_group) > 1:
-                        group_name = f"position_group_{group_id}"
-                        groups[group_name] = [f.name for f in current_group]
-                        group_id += 1
-                    current_group = [field]
-
-                last_y = field.position.y
-
-            # Don't forget the last group
-            if len(current_group) > 1:
-                group_name = f"position_group_{group_id}"
-                groups[group_name] = [f.name for f in current_group]
-                group_id += 1
+            # Group fields that are close to each other vertically
+            for row in self._split_into_rows(fields):
+                if len(row) > 1:
+                    group_name = f"position_group_{group_id}"
+                    groups[group_name] = [f.name for f in row]
+                    group_id += 1
+
+        self.logger.debug("Position detection found %d groups", len(groups))
+        return groups
+
+    def _detect_by_position_arrays(self,
+                                   radio_fields: List[FormField],
+                                   pages: "np.ndarray",
+                                   xs: "np.ndarray",
+                                   ys: "np.ndarray") -> Dict[str, List[str]]:
+        """Vectorised position grouping over precomputed page/x/y arrays."""
+        # Sort by page, then top to bottom, then left to right
+        order = np.lexsort((xs, ys, pages))
 
-        self.logger.debug(f"Position detection found {len(groups)} groups")
+        # A new row starts at every page change or vertical gap above the threshold
+        row_breaks = (np.diff(pages[order]) != 0) | (np.diff(ys[order]) > _ROW_Y_THRESHOLD)
+        segments = np.split(order, np.nonzero(row_breaks)[0] + 1)
+
+        groups = {}
+        group_id = 0
+        for segment in segments:
+            if segment.size > 1:
+                groups[f"position_group_{group_id}"] = [radio_fields[i].name for i in segment]
+                group_id += 1
         return groups
 
+    def _split_into_rows(self, fields: List[FormField]) -> List[List[FormField]]:
+        """
+        Sort fields top to bottom, left to right and split them wherever the
+        vertical gap to the previous field exceeds the row threshold.
+        """
+        # Read each position once; FormField is a pydantic model, so every
+        # attribute hop goes through its instance dict
+        keyed = []
+        for index, field in enumerate(fields):
+            position = field.position
+            keyed.append((position.y, position.x, index))
+        keyed.sort()
+
+        rows = []
+        current_row = []
+        last_y = None
+        for y, _, index in keyed:
+            if last_y is None or abs(y - last_y) <= _ROW_Y_THRESHOLD:
+                current_row.append(fields[index])
+            else:
+                # Start new row if far apart
+                rows.append(current_row)
+                current_row = [fields[index]]
+            last_y = y
+        if current_row:
+            rows.append(current_row)
+        return rows
+
     def _detect_by_labels(self, radio_fields: List[FormField]) -> Dict[str, List[str]]:
         """Detect radio groups by analyzing field labels for common categories."""
         groups = {}
 
-        # Common radio group categories
-        category_patterns = {
-            'gender': ['male', 'female', 'other', 'm', 'f'],
-            'payment_method': ['ach', 'check', 'wire', 'credit', 'debit', 'cash'],
-            'frequency': ['monthly', 'quarterly', 'annual', 'weekly', 'daily'],
-            'yes_no': ['yes', 'no', 'y', 'n', 'true', 'false'],
-            'dividend': ['cash', 'reduce', 'accumulate', 'paid'],
-            'withdrawal': ['systematic', 'lump', 'partial', 'full'],
-            'marital_status': ['single', 'married', 'divorced', 'widowed'],
-            'employment': ['employed', 'retired', 'unemployed', 'student']
-        }
+        # Lowercase each field's name and label once, not once per category
+        texts = [(field.name, (field.name + ' ' + field.label).lower()) for field in radio_fields]
 
-        for category, keywords in category_patterns.items():
-            category_fields = []
-
-            for field in radio_fields:
-                field_text = (field.name + ' ' + field.label).lower()
-
-                # Check if any keyword appears in the field name or label
-                for keyword in keywords:
-                    if keyword in field_text:
-                        category_fields.append(field.name)
-                        break
+        for category, pattern in self._category_res.items():
+            search = pattern.search
+            category_fields = [name for name, text in texts if search(text)]
 
             if len(category_fields) > 1:
                 groups[category] = category_fields
 
-        self.logger.debug(f"Label detection found {len(groups)} groups")
+        self.logger.debug("Label detection found %d groups", len(groups))
         return groups
 
     def _merge_detection_results(self,
@@ -325,40 +514,25 @@ class RadioGroupDetector:
 
         # Start with pattern-based groups (most reliable)
         merged_groups = dict(pattern_groups)
+        used = set().union(*pattern_groups.values())
 
-        # Add position-based groups that don't conflict
-        for pos_group_name, pos_fields in position_groups.items():
-            # Check if any of these fields are already in a pattern group
-            already_grouped = any(
-                field in existing_fields
-                for existing_fields in merged_groups.values()
-                for field in pos_fields
-            )
-
-            if not already_grouped:
-                merged_groups[pos_group_name] = pos_fields
-
-        # Add label-based groups that don't conflict
-        for label_group_name, label_fields in label_groups.items():
-            # Check if any of these fields are already grouped
-            already_grouped = any(
-                field in existing_fields
-                for existing_fields in merged_groups.values()
-                for field in label_fields
-            )
-
-            if not already_grouped:
-                merged_groups[label_group_name] = label_fields
+        # Add position-based groups, then label-based groups, that don't conflict
+        # with any field already grouped
+        for candidate_groups in (position_groups, label_groups):
+            for group_name, group_fields in candidate_groups.items():
+                if not any(field in used for field in group_fields):
+                    merged_groups[group_name] = group_fields
+                    used.update(group_fields)
 
         # Validate and clean up groups
         validated_groups = {}
         for group_name, field_names in merged_groups.items():
             # Remove duplicates and ensure minimum group size
-            unique_fields = list(set(field_names))
+            unique_fields = list(dict.fromkeys(field_names))
             if len(unique_fields) > 1:
                 validated_groups[group_name] = unique_fields
 
-        self.logger.info(f"Final merged groups: {len(validated_groups)}")
+        self.logger.info("Final merged groups: %d", len(validated_groups))
         return validated_groups
 
 
@@ -379,10 +553,10 @@ class SmartFieldTypeDetector:
         type_by_name = self._analyze_field_name(field_name)
 
         # Signal 3: Field properties analysis
-        type_by_properties = self._analyze_field_properties(widget)
+        type_by_properties = self._properties_signal(widget)
 
         # Signal 4: Widget attributes analysis
-        type_by_attributes = self._analyze_widget_attributes(widget)
+        type_by_attributes = self._attributes_signal(widget)
 
         # Combine signals with confidence scoring
         return self._combine_type_signals(
@@ -391,105 +565,62 @@ class SmartFieldTypeDetector:
 
     def _analyze_widget_type(self, widget: any) -> Tuple[FieldType, float]:
         """Analyze widget type (primary signal)."""
-        widget_type = type(widget).__name__
-
-        # Map PyPDFForm widget types to our FieldType enum with confidence
-        type_mapping = {
-            "Text": (FieldType.TEXT_FIELD, 0.9),
-            "Checkbox": (FieldType.CHECKBOX, 0.9),
-            "Radio": (FieldType.RADIO_BUTTON, 0.9),
-            "Dropdown": (FieldType.DROPDOWN, 0.9),
-            "Signature": (FieldType.SIGNATURE, 0.9),
-            "Button": (FieldType.BUTTON, 0.9),
-            "ListBox": (FieldType.LISTBOX, 0.9),
-        }
+        widget_class = type(widget)
 
-        return type_mapping.get(widget_type, (FieldType.TEXT_FIELD, 0.5))
+        # Fast path: widget classes already seen are keyed by identity
+        signal = _WIDGET_CLASS_SIGNALS.get(widget_class)
+        if signal is None:
+            signal = _WIDGET_NAME_SIGNALS.get(widget_class.__name__, (FieldType.TEXT_FIELD, 0.5))
+            _WIDGET_CLASS_SIGNALS[widget_class] = signal
+        return signal
 
     def _analyze_field_name(self, field_name: str) -> Tuple[FieldType, float]:
         """Analyze field name patterns."""
-        field_name_lower = field_name.lower()
-
-        # Signature field patterns
-        signature_patterns = ['signature', 'sign', 'autograph', 'signed']
-        if any(pattern in field_name_lower for pattern in signature_patterns):
-            return (FieldType.SIGNATURE, 0.8)
-
-        # Date field patterns
-        date_patterns = ['date', 'day', 'month', 'year', 'time', 'timestamp']
-        if any(pattern in field_name_lower for pattern in date_patterns):
-            return (FieldType.TEXT_FIELD, 0.7)  # Dates are typically text fields
-
-        # Checkbox patterns
-        checkbox_patterns = ['check', 'box', 'option', 'select', 'yes', 'no', 'agree', 'consent']
-        if any(pattern in field_name_lower for pattern in checkbox_patterns):
-            return (FieldType.CHECKBOX, 0.6)
-
-        # Radio button patterns
-        radio_patterns = ['radio', 'choice', 'group', 'option']
-        if any(pattern in field_name_lower for pattern in radio_patterns):
-            return (FieldType.RADIO_BUTTON, 0.6)
+        return self._name_signal(field_name.lower())
 
-        # Dropdown patterns
-        dropdown_patterns = ['dropdown', 'select', 'list', 'menu', 'combo']
-        if any(pattern in field_name_lower for pattern in dropdown_patterns):
-            return (FieldType.DROPDOWN, 0.6)
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _name_signal(field_name_lower: str) -> Tuple[FieldType, float]:
+        """Map a lowercased field name to its (type, confidence) signal."""
+        match = _NAME_SIGNAL_RE.match(field_name_lower)
+        if match:
+            return _NAME_SIGNALS[match.lastgroup]
 
         # Default to text field
         return (FieldType.TEXT_FIELD, 0.3)
 
-    def _analyze_field_properties(self, widget: any) -> Tuple[FieldType, float]:
-        """Analyze field properties and characteristics."""
-
+    @staticmethod
+    def _properties_signal(widget: any) -> Tuple[FieldType, float]:
+        """Signal from field properties and characteristics."""
         # Check for choices (indicates dropdown or radio)
         choices = getattr(widget, 'choices', None)
-        if choices and len(choices) > 0:
+        if choices:
             # If many choices, likely dropdown; if few, likely radio
             if len(choices) > 5:
                 return (FieldType.DROPDOWN, 0.7)
-            else:
-                return (FieldType.RADIO_BUTTON, 0.6)
+            return (FieldType.RADIO_BUTTON, 0.6)
 
-        # Check multiline property (text field specific)
-        multiline = getattr(widget, 'multiline', None)
-        if multiline is True:
+        # Multiline and max_length are text field specific
+        if getattr(widget, 'multiline', None) is True:
             return (FieldType.TEXT_FIELD, 0.8)
 
-        # Check max_length (text field specific)
         max_length = getattr(widget, 'max_length', None)
         if max_length is not None and max_length > 0:
             return (FieldType.TEXT_FIELD, 0.7)
 
-        # Check readonly property
-        readonly = getattr(widget, 'readonly', None)
-        if readonly is True:
-            # Readonly fields are often display-only text fields
+        # Readonly fields are often display-only text fields
+        if getattr(widget, 'readonly', None) is True:
             return (FieldType.TEXT_FIELD, 0.6)
 
         return (FieldType.TEXT_FIELD, 0.2)
 
-    def _analyze_widget_attributes(self, widget: any) -> Tuple[FieldType, float]:
-        """Analyze specific widget attributes for type hints."""
-
-        # Check for button-specific attributes
-        if hasattr(widget, 'action') or hasattr(widget, 'onclick'):
-            return (FieldType.BUTTON, 0.7)
-
-        # Check for signature-specific attributes
-        if hasattr(widget, 'signature_type') or hasattr(widget, 'ink'):
-            return (FieldType.SIGNATURE, 0.8)
-
-        # Check for radio button grouping attributes
-        if hasattr(widget, 'group') or hasattr(widget, 'radio_group'):
-            return (FieldType.RADIO_BUTTON, 0.7)
-
-        # Check for checkbox-specific attributes
-        if hasattr(widget, 'checked') or hasattr(widget, 'check_state'):
-            return (FieldType.CHECKBOX, 0.7)
-
-        # Check for text field attributes
-        if hasattr(widget, 'text_align') or hasattr(widget, 'font_size'):
-            return (FieldType.TEXT_FIELD, 0.6)
+    @staticmethod
+    def _attributes_signal(widget: any) -> Tuple[FieldType, float]:
+        """Signal from type-specific widget attributes, checked in priority order."""
+        for attr_names, signal in _WIDGET_ATTRIBUTE_SIGNALS:
+            for attr_name in attr_names:
+                if hasattr(widget, attr_name):
+                    return signal
 
         return (FieldType.TEXT_FIELD, 0.1)
 
@@ -499,26 +630,26 @@ class SmartFieldTypeDetector:
                              properties_signal: Tuple[FieldType, float],
                              attributes_signal: Tuple[FieldType, float]) -> FieldType:
         """Combine signals with confidence scoring."""
-
-        # Create scoring dictionary
-        scores = {}
-
-        # Add weighted scores for each signal
-        signals = [
-            (widget_signal, 1.0),      # Widget type is most reliable
-            (name_signal, 0.6),        # Name patterns are moderately reliable
-            (properties_signal, 0.8),  # Properties are quite reliable
-            (attributes_signal, 0.7)   # Attributes are reliable
-        ]
-
-        for (field_type, confidence), weight in signals:
-            final_score = confidence * weight
-            if field_type not in scores:
-                scores[field_type] = 0
-            scores[field_type] += final_score
-
-        # Choose the field type with the highest score
-        best_type = max(scores.items(), key=lambda x: x[1])
-
-        self.logger.debug(f"Field type scores: {scores}, chosen: {best_type[0]}")
-        return best_type[0]
+        index = _FIELD_TYPE_INDEX
+        w_widget, w_name, w_properties, w_attributes = _SIGNAL_WEIGHTS
+
+        # Accumulate weighted confidence per field type
+        scores = [0.0] * len(_FIELD_TYPES)
+        scores[index[widget_signal[0]]] += widget_signal[1] * w_widget
+        scores[index[name_signal[0]]] += name_signal[1] * w_name
+        scores[index[properties_signal[0]]] += properties_signal[1] * w_properties
+        scores[index[attributes_signal[0]]] += attributes_signal[1] * w_attributes
+
+        # Choose the field type with the highest score; ties go to the type whose
+        # signal came first
+        best_type = widget_signal[0]
+        best_score = scores[index[best_type]]
+        for field_type in (name_signal[0], properties_signal[0], attributes_signal[0]):
+            score = scores[index[field_type]]
+            if score > best_score:
+                best_type, best_score = field_type, score
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            nonzero = {ft: score for ft, score in zip(_FIELD_TYPES, scores) if score}
+            self.logger.debug(f"Field type scores: {nonzero}, chosen: {best_type}")
+        return best_type
@@ -6,8 +6,9 @@ positions, and types. Supports BEM name mapping and validation.
 """
 
 import logging
-import shutil
+import re
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
@@ -19,6 +20,21 @@ from .enhanced_field_detector import EnhancedFieldDetector, FieldDetectionResult
 
 logger = logging.getLogger(__name__)
 
+# Flexible BEM pattern supporting full hierarchy:
+# - block (e.g., dividend-option)
+# - block_element (e.g., dividend-option_cash)
+# - block__modifier (e.g., dividend-option__cash)
+# - block_element__modifier (e.g., name-change_reason__marriage)
+# - block--group (e.g., dividend-option--group)
+# - block_element--group (e.g., payment-method_options--group)
+#
+# Pattern breakdown:
+# - ^[a-z][a-z0-9-]*           : block (starts with letter, allows hyphens)
+# - (?:_[a-z][a-z0-9-]*)?      : optional element (underscore + name)
+# - (?:__[a-z][a-z0-9-]*|--group)? : optional modifier OR group suffix
+# - $                          : end of string
+_BEM_NAME_RE = re.compile(r'^[a-z][a-z0-9-]*(?:_[a-z][a-z0-9-]*)?(?:__[a-z][a-z0-9-]*|--group)?$')
+
 
 class PDFModifier:
     """Modifies PDF form fields while preserving all properties."""
@@ -55,6 +71,7 @@ class PDFModifier:
         preserve_original: bool = True,
         validate_mappings: bool = True,
         create_backup: bool = True,
+        detection_result: Optional[FieldDetectionResult] = None,
     ) -> FieldModificationResult:
         """
         Modify PDF form fields using BEM name mappings.
@@ -66,6 +83,8 @@ class PDFModifier:
             preserve_original: Whether to keep the original file unchanged
             validate_mappings: Whether to validate BEM name format
             create_backup: Whether to create a backup of the original
+            detection_result: Detection result already computed for `pdf_path`;
+                skips running detection again when provided
             
         Returns:
             FieldModificationResult with modification details and status
@@ -109,8 +128,9 @@ class PDFModifier:
             logger.info(f"PyPDFForm detected {field_count_before} form fields")
 
             # Enhanced field detection using multiple methods
-            logger.info("Running enhanced field detection...")
-            detection_result = self.enhanced_detector.detect_all_fields(pdf_path)
+            if detection_result is None:
+                logger.info("Running enhanced field detection...")
+                detection_result = self.enhanced_detector.detect_all_fields(pdf_path)
             enhanced_field_count = detection_result.get_field_count()
             
             logger.info(f"Enhanced detection found {enhanced_field_count} total fields")
@@ -137,7 +157,7 @@ class PDFModifier:
 
             # Log field mappings to be applied
             logger.info(f"Attempting to apply {len(field_mappings)} field mappings")
-            for original, bem_name in list(field_mappings.items())[:5]:
+            for original, bem_name in islice(field_mappings.items(), 5):
                 logger.debug(f"  Mapping: '{original}' → '{bem_name}'")
             if len(field_mappings) > 5:
                 logger.debug(f"  ... and {len(field_mappings) - 5} more mappings")
@@ -167,19 +187,12 @@ class PDFModifier:
             # Save modified PDF
             logger.info(f"Saving modified PDF to: {output_path}")
             try:
-                if preserve_original:
-                    logger.debug("Preserving original, creating copy for modification")
-                    # Copy original to output path first
-                    shutil.copy2(pdf_path, output_path)
-                    # Create new PDF wrapper for the copy
-                    pdf_copy = PdfWrapper(str(output_path))
-                    # Apply modifications to the copy
-                    _, _, _ = await self._apply_field_modifications(pdf_copy, field_mappings)
-                    pdf_copy.write(str(output_path))
-                else:
-                    logger.debug("Modifying original PDF directly")
-                    # Write directly to output path
-                    pdf.write(str(output_path))
+                # The renames were applied to the in-memory document, so writing it
+                # to output_path leaves the source file untouched; only an output
+                # path that is the source itself can overwrite the original
+                if preserve_original and output_path.resolve() == pdf_path.resolve():
+                    raise ValueError("Output path is the original PDF; refusing to overwrite it")
+                pdf.write(str(output_path))
 
                 logger.info(f"Successfully saved modified PDF: {output_path}")
             except Exception as e:
@@ -301,7 +314,7 @@ class PDFModifier:
             # Check if fields exist in other detection methods
             for missing_field in missing_fields[:5]:  # Limit logging
                 if missing_field in all_detected_fields:
-                    sources = detection_result.field_sources.get(missing_field, [])
+                    sources = sorted(detection_result.field_sources.get(missing_field, ()))
                     logger.info(f"Field '{missing_field}' found in: {sources}")
                     
                 # Try to find similar field names in PyPDFForm
@@ -387,25 +400,7 @@ class PDFModifier:
 
     def _is_valid_bem_name(self, name: str) -> bool:
         """Check if a name follows BEM conventions."""
-        import re
-
-        # Flexible BEM pattern supporting full hierarchy:
-        # - block (e.g., dividend-option)
-        # - block_element (e.g., dividend-option_cash)
-        # - block__modifier (e.g., dividend-option__cash)
-        # - block_element__modifier (e.g., name-change_reason__marriage)
-        # - block--group (e.g., dividend-option--group)
-        # - block_element--group (e.g., payment-method_options--group)
-        #
-        # Pattern breakdown:
-        # - ^[a-z][a-z0-9-]*           : block (starts with letter, allows hyphens)
-        # - (?:_[a-z][a-z0-9-]*)?      : optional element (underscore + name)
-        # - (?:__[a-z][a-z0-9-]*|--group)? : optional modifier OR group suffix
-        # - $                          : end of string
-
-        bem_pattern = r'^[a-z][a-z0-9-]*(?:_[a-z][a-z0-9-]*)?(?:__[a-z][a-z0-9-]*|--group)?$'
-
-        return re.match(bem_pattern, name) is not None
+        return _BEM_NAME_RE.match(name) is not None
 
     async def _apply_field_modifications(
         self, pdf: PdfWrapper, field_mappings: Dict[str, str]
@@ -768,6 +763,8 @@ class PDFModifier:
             self.enhanced_detector = EnhancedFieldDetector()
             
         detection_result = self.enhanced_detector.detect_all_fields(pdf_path)
+        # Kept so callers can hand it to modify_fields instead of detecting again
+        self._last_detection_result = detection_result
         return self.enhanced_detector.generate_field_report(detection_result)
 
     def get_last_detection_result(self) -> Optional[FieldDetectionResult]:
@@ -7,80 +7,146 @@ comprehensive field discovery reports and validate field mappings.
 """
 
 import argparse
+import hashlib
+import io
 import json
 import logging
 import sys
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector
+from src.pdf_enrichment.enhanced_field_detector import (
+    EnhancedFieldDetector,
+    FieldDetectionResult,
+    default_cache_dir,
+)
 from src.pdf_enrichment.pdf_modifier import PDFModifier
 from src.pdf_enrichment.utils import setup_logging
 
 
-def analyze_pdf_fields(pdf_path: Path, output_dir: Path = None) -> None:
-    """Analyze PDF fields using multiple detection methods."""
+def _format_bullets(items, indent: str = "  ") -> str:
+    """Format an indented "- item" line per item."""
+    return "".join(f"{indent}- {item}\n" for item in items)
+
+
+def _print_bullets(items, indent: str = "  ") -> None:
+    """Print an indented "- item" line per item with a single stdout write."""
+    sys.stdout.write(_format_bullets(items, indent))
+
+
+def _compare_sorted(fields1: Iterable[str], fields2: Iterable[str]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Split two field name collections into (common, only in first, only in second).
+
+    Both inputs are sorted once and merged in a single two-pointer walk, so all
+    three results come out already sorted.
+    """
+    sorted1 = sorted(fields1)
+    sorted2 = sorted(fields2)
+    common, only1, only2 = [], [], []
+    i = j = 0
+    len1, len2 = len(sorted1), len(sorted2)
+    while i < len1 and j < len2:
+        name1 = sorted1[i]
+        name2 = sorted2[j]
+        if name1 == name2:
+            common.append(name1)
+            i += 1
+            j += 1
+        elif name1 < name2:
+            only1.append(name1)
+            i += 1
+        else:
+            only2.append(name2)
+            j += 1
+    only1.extend(sorted1[i:])
+    only2.extend(sorted2[j:])
+    return common, only1, only2
+
+
+def _is_same_pdf(pdf1_path: Path, pdf2_path: Path) -> bool:
+    """Check whether two paths are the same file or byte-identical copies."""
+    if pdf1_path.samefile(pdf2_path):
+        return True
+    if pdf1_path.stat().st_size != pdf2_path.stat().st_size:
+        return False
+    return (hashlib.sha256(pdf1_path.read_bytes()).digest()
+            == hashlib.sha256(pdf2_path.read_bytes()).digest())
+
+
+def analyze_pdf_fields(pdf_path: Path, output_dir: Path = None,
+                       detector: Optional[EnhancedFieldDetector] = None) -> FieldDetectionResult:
+    """Analyze PDF fields using multiple detection methods and return the detection result."""
     if output_dir is None:
         output_dir = pdf_path.parent
     
     # Create enhanced detector
-    detector = EnhancedFieldDetector()
+    if detector is None:
+        detector = EnhancedFieldDetector()
     
     # Run field detection
     print(f"🔍 Analyzing PDF: {pdf_path}")
     detection_result = detector.detect_all_fields(pdf_path)
     
-    # Print summary
-    print(f"\n📊 Field Detection Summary:")
-    summary = detection_result.get_detection_summary()
-    for method, count in summary.items():
-        print(f"  {method}: {count} fields")
-    
-    # Generate detailed report
-    report = detector.generate_field_report(detection_result)
-    
-    # Save report
-    report_file = output_dir / f"{pdf_path.stem}_field_analysis.md"
-    with open(report_file, 'w') as f:
-        f.write(report)
-    print(f"📋 Detailed report saved to: {report_file}")
-    
-    # Save JSON data
-    json_data = {
-        "pdf_file": str(pdf_path),
-        "detection_summary": summary,
-        "pypdfform_fields": detection_result.pypdfform_fields,
-        "pymupdf_fields": detection_result.pymupdf_fields,
-        "pypdf2_fields": detection_result.pypdf2_fields,
-        "annotation_fields": detection_result.annotation_fields,
-        "all_fields": sorted(list(detection_result.all_fields)),
-        "field_sources": detection_result.field_sources,
-        "detection_errors": detection_result.detection_errors,
-        "detection_warnings": detection_result.detection_warnings
-    }
-    
-    json_file = output_dir / f"{pdf_path.stem}_field_analysis.json"
-    with open(json_file, 'w') as f:
-        json.dump(json_data, f, indent=2)
-    print(f"📊 JSON data saved to: {json_file}")
-    
-    # Print errors/warnings if any
-    if detection_result.detection_errors:
-        print(f"\n❌ Detection Errors:")
-        for error in detection_result.detection_errors:
-            print(f"  - {error}")
-    
-    if detection_result.detection_warnings:
-        print(f"\n⚠️ Detection Warnings:")
-        for warning in detection_result.detection_warnings:
-            print(f"  - {warning}")
-
-
-def validate_field_mapping(pdf_path: Path, mapping_file: Path) -> None:
-    """Validate field mapping against PDF fields."""
+    # Build the console summary in memory and write it once, even if saving fails
+    buf = io.StringIO()
+    w = buf.write
+    try:
+        w("\n📊 Field Detection Summary:\n")
+        summary = detection_result.get_detection_summary()
+        for method, count in summary.items():
+            w(f"  {method}: {count} fields\n")
+        
+        # Generate detailed report
+        report = detector.generate_field_report(detection_result)
+        
+        # Save report
+        report_file = output_dir / f"{pdf_path.stem}_field_analysis.md"
+        report_file.write_text(report)
+        w(f"📋 Detailed report saved to: {report_file}\n")
+        
+        # Save JSON data
+        json_data = {
+            "pdf_file": str(pdf_path),
+            "detection_summary": summary,
+            "pypdfform_fields": detection_result.pypdfform_fields,
+            "pymupdf_fields": detection_result.pymupdf_fields,
+            "pypdf2_fields": detection_result.pypdf2_fields,
+            "annotation_fields": detection_result.annotation_fields,
+            "all_fields": detection_result.sorted_fields,
+            "field_sources": {
+                name: sorted(sources) for name, sources in detection_result.field_sources.items()
+            },
+            "detection_errors": detection_result.detection_errors,
+            "detection_warnings": detection_result.detection_warnings
+        }
+        
+        json_file = output_dir / f"{pdf_path.stem}_field_analysis.json"
+        json_file.write_text(json.dumps(json_data, indent=2))
+        w(f"📊 JSON data saved to: {json_file}\n")
+        
+        # Print errors/warnings if any
+        if detection_result.detection_errors:
+            w("\n❌ Detection Errors:\n")
+            w(_format_bullets(detection_result.detection_errors))
+        
+        if detection_result.detection_warnings:
+            w("\n⚠️ Detection Warnings:\n")
+            w(_format_bullets(detection_result.detection_warnings))
+    finally:
+        sys.stdout.write(buf.getvalue())
+    
+    return detection_result
+
+
+def validate_field_mapping(pdf_path: Path, mapping_file: Path,
+                           detection_result: Optional[FieldDetectionResult] = None,
+                           detector: Optional[EnhancedFieldDetector] = None) -> None:
+    """Validate field mapping against PDF fields, reusing `detection_result` when given."""
     print(f"🔍 Validating mapping: {mapping_file}")
     print(f"📄 Against PDF: {pdf_path}")
     
@@ -92,8 +158,10 @@ def validate_field_mapping(pdf_path: Path, mapping_file: Path) -> None:
     expected_fields = set(field_mappings.keys())
     
     # Analyze PDF fields
-    detector = EnhancedFieldDetector()
-    detection_result = detector.detect_all_fields(pdf_path)
+    if detector is None:
+        detector = EnhancedFieldDetector()
+    if detection_result is None:
+        detection_result = detector.detect_all_fields(pdf_path)
     
     # Check field availability
     modifiable_fields = set(detection_result.pypdfform_fields)
@@ -117,69 +185,91 @@ def validate_field_mapping(pdf_path: Path, mapping_file: Path) -> None:
         print(f"\n💡 Suggestions for Missing Fields:")
         suggestions = detector.suggest_missing_fields(modifiable_fields, missing_modifiable)
         
+        suggestion_lines = []
         for missing_field, suggested_fields in suggestions.items():
-            print(f"  '{missing_field}':")
+            suggestion_lines.append(f"  '{missing_field}':")
             if suggested_fields:
-                for suggestion in suggested_fields[:3]:
-                    print(f"    - {suggestion}")
+                suggestion_lines.extend(f"    - {suggestion}" for suggestion in suggested_fields[:3])
             else:
-                print(f"    - No similar fields found")
+                suggestion_lines.append(f"    - No similar fields found")
                 
             # Check if field exists in other detection methods
             if missing_field in all_detected_fields:
-                sources = detection_result.field_sources.get(missing_field, [])
-                print(f"    - Found in: {', '.join(sources)}")
+                sources = detection_result.field_sources.get(missing_field, ())
+                suggestion_lines.append(f"    - Found in: {', '.join(sorted(sources))}")
+        if suggestion_lines:
+            sys.stdout.write("\n".join(suggestion_lines) + "\n")
     
     # Show available fields
     print(f"\n📋 Available PyPDFForm Fields:")
-    for field in sorted(modifiable_fields):
-        print(f"  - {field}")
+    _print_bullets(sorted(modifiable_fields))
 
 
-def compare_pdfs(pdf1_path: Path, pdf2_path: Path) -> None:
-    """Compare field detection between two PDFs."""
+def compare_pdfs(pdf1_path: Path, pdf2_path: Path,
+                 detection_result1: Optional[FieldDetectionResult] = None,
+                 detector: Optional[EnhancedFieldDetector] = None) -> None:
+    """Compare field detection between two PDFs, reusing `detection_result1` for the first when given."""
     print(f"🔍 Comparing PDFs:")
     print(f"  PDF 1: {pdf1_path}")
     print(f"  PDF 2: {pdf2_path}")
     
-    detector = EnhancedFieldDetector()
+    if detector is None:
+        detector = EnhancedFieldDetector()
     
-    # Analyze both PDFs
-    result1 = detector.detect_all_fields(pdf1_path)
-    result2 = detector.detect_all_fields(pdf2_path)
+    if _is_same_pdf(pdf1_path, pdf2_path):
+        # Identical contents always compare equal, so detect once and reuse it
+        result1 = result2 = detection_result1 or detector.detect_all_fields(pdf1_path)
+    elif detection_result1 is not None:
+        result1 = detection_result1
+        result2 = detector.detect_all_fields(pdf2_path)
+    else:
+        # One PDF at a time: each call already runs its backends in parallel, and
+        # PyMuPDF must not be used from two threads at once
+        result1 = detector.detect_all_fields(pdf1_path)
+        result2 = detector.detect_all_fields(pdf2_path)
     
     # Compare results
     fields1 = result1.all_fields
     fields2 = result2.all_fields
     
-    common_fields = fields1 & fields2
-    unique_to_pdf1 = fields1 - fields2
-    unique_to_pdf2 = fields2 - fields1
+    common_fields, unique_to_pdf1, unique_to_pdf2 = _compare_sorted(fields1, fields2)
     
-    print(f"\n📊 Field Comparison:")
-    print(f"  PDF 1 fields: {len(fields1)}")
-    print(f"  PDF 2 fields: {len(fields2)}")
-    print(f"  Common fields: {len(common_fields)}")
-    print(f"  Unique to PDF 1: {len(unique_to_pdf1)}")
-    print(f"  Unique to PDF 2: {len(unique_to_pdf2)}")
+    buf = io.StringIO()
+    w = buf.write
+    w("\n📊 Field Comparison:\n")
+    w(f"  PDF 1 fields: {len(fields1)}\n")
+    w(f"  PDF 2 fields: {len(fields2)}\n")
+    w(f"  Common fields: {len(common_fields)}\n")
+    w(f"  Unique to PDF 1: {len(unique_to_pdf1)}\n")
+    w(f"  Unique to PDF 2: {len(unique_to_pdf2)}\n")
     
     if unique_to_pdf1:
-        print(f"\n📋 Fields unique to PDF 1:")
-        for field in sorted(unique_to_pdf1):
-            print(f"  - {field}")
+        w("\n📋 Fields unique to PDF 1:\n")
+        w(_format_bullets(unique_to_pdf1))
     
     if unique_to_pdf2:
-        print(f"\n📋 Fields unique to PDF 2:")
-        for field in sorted(unique_to_pdf2):
-            print(f"  - {field}")
+        w("\n📋 Fields unique to PDF 2:\n")
+        w(_format_bullets(unique_to_pdf2))
+    
+    sys.stdout.write(buf.getvalue())
+
+
+def _existing_path(value: str) -> Path:
+    """argparse type that only accepts paths that exist."""
+    path = Path(value)
+    if not path.exists():
+        raise argparse.ArgumentTypeError(f"file not found: {path}")
+    return path
 
 
 def main():
     parser = argparse.ArgumentParser(description="Analyze PDF form fields using multiple detection methods")
-    parser.add_argument("pdf_file", help="Path to PDF file to analyze")
+    parser.add_argument("pdf_file", type=_existing_path, help="Path to PDF file to analyze")
     parser.add_argument("--output-dir", help="Output directory for reports (default: same as PDF)")
-    parser.add_argument("--validate-mapping", help="Validate field mapping JSON file against PDF")
-    parser.add_argument("--compare-with", help="Compare fields with another PDF")
+    parser.add_argument("--validate-mapping", type=_existing_path, help="Validate field mapping JSON file against PDF")
+    parser.add_argument("--compare-with", type=_existing_path, help="Compare fields with another PDF")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the on-disk field detection cache")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     
     args = parser.parse_args()
@@ -188,35 +278,27 @@ def main():
     log_level = logging.DEBUG if args.verbose else logging.INFO
     setup_logging(level=log_level)
     
-    # Validate PDF file
-    pdf_path = Path(args.pdf_file)
-    if not pdf_path.exists():
-        print(f"❌ PDF file not found: {pdf_path}")
-        sys.exit(1)
+    pdf_path = args.pdf_file
     
     # Set output directory
     output_dir = Path(args.output_dir) if args.output_dir else pdf_path.parent
     output_dir.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Main analysis
-        analyze_pdf_fields(pdf_path, output_dir)
+        # Main analysis; the result is shared with the optional steps below so
+        # the PDF is only parsed once
+        detector = EnhancedFieldDetector(cache_dir=None if args.no_cache else default_cache_dir())
+        detection_result = analyze_pdf_fields(pdf_path, output_dir, detector=detector)
         
         # Validate mapping if provided
         if args.validate_mapping:
-            mapping_file = Path(args.validate_mapping)
-            if not mapping_file.exists():
-                print(f"❌ Mapping file not found: {mapping_file}")
-                sys.exit(1)
-            validate_field_mapping(pdf_path, mapping_file)
+            validate_field_mapping(pdf_path, args.validate_mapping,
+                                   detection_result=detection_result, detector=detector)
         
         # Compare with another PDF if provided
         if args.compare_with:
-            compare_pdf_path = Path(args.compare_with)
-            if not compare_pdf_path.exists():
-                print(f"❌ Comparison PDF not found: {compare_pdf_path}")
-                sys.exit(1)
-            compare_pdfs(pdf_path, compare_pdf_path)
+            compare_pdfs(pdf_path, args.compare_with,
+                         detection_result1=detection_result, detector=detector)
             
         print(f"\n✅ Analysis complete!")
         
@@ -39,8 +39,8 @@ async def main():
     
     # Load mapping data
     logger.info(f"Loading BEM mappings from: {mapping_file}")
-    with open(mapping_file, 'r') as f:
-        mapping_data = json.load(f)
+    payload = await asyncio.to_thread(mapping_file.read_text)
+    mapping_data = await asyncio.to_thread(json.loads, payload)
     
     # Extract field mappings
     field_mappings = mapping_data.get('bem_mappings', {})
@@ -60,25 +60,26 @@ async def main():
     # Generate field detection report before modification
     logger.info("Generating field detection report...")
     detection_report = modifier.generate_field_detection_report(pdf_file)
+    detection_result = modifier.get_last_detection_result()
     
-    # Save detection report
+    # Apply modifications, saving the detection report in a worker thread meanwhile
     detection_report_file = pdf_file.with_suffix('.detection_report.md')
-    with open(detection_report_file, 'w') as f:
-        f.write(detection_report)
-    logger.info(f"Field detection report saved to: {detection_report_file}")
-    
-    # Apply modifications
     logger.info(f"Applying BEM mappings to: {pdf_file}")
     logger.info(f"Output file: {output_file}")
     
-    result = await modifier.modify_fields(
-        pdf_path=pdf_file,
-        field_mappings=field_mappings,
-        output_path=output_file,
-        preserve_original=True,
-        validate_mappings=True,
-        create_backup=False
+    _, result = await asyncio.gather(
+        asyncio.to_thread(detection_report_file.write_text, detection_report),
+        modifier.modify_fields(
+            pdf_path=pdf_file,
+            field_mappings=field_mappings,
+            output_path=output_file,
+            preserve_original=True,
+            validate_mappings=True,
+            create_backup=False,
+            detection_result=detection_result,
+        ),
     )
+    logger.info(f"Field detection report saved to: {detection_report_file}")
     
     # Get detection result for additional analysis
     detection_result = modifier.get_last_detection_result()
@@ -112,26 +113,24 @@ async def main():
         
         if result.modifications:
             print("\nField modifications:")
-            for mod in result.modifications[:10]:  # Show first 10
-                print(f"  '{mod['old']}' → '{mod['new']}'")
+            # Show first 10, written in one go
+            lines = [f"  '{mod['old']}' → '{mod['new']}'\n" for mod in result.modifications[:10]]
             if len(result.modifications) > 10:
-                print(f"  ... and {len(result.modifications) - 10} more")
+                lines.append(f"  ... and {len(result.modifications) - 10} more\n")
+            sys.stdout.write("".join(lines))
         
         if result.warnings:
             print("\nWarnings:")
-            for warning in result.warnings:
-                print(f"  ⚠️ {warning}")
+            sys.stdout.write("".join(f"  ⚠️ {warning}\n" for warning in result.warnings))
     else:
         print(f"❌ Failed to modify PDF")
         print(f"Errors: {len(result.errors)}")
-        for error in result.errors:
-            print(f"  ❌ {error}")
+        sys.stdout.write("".join(f"  ❌ {error}\n" for error in result.errors))
     
     # Generate report
     report = modifier.create_field_mapping_report(result)
     report_file = output_file.with_suffix('.report.md')
-    with open(report_file, 'w') as f:
-        f.write(report)
+    await asyncio.to_thread(report_file.write_text, report)
     
     print(f"\nDetailed report saved to: {report_file}")
 
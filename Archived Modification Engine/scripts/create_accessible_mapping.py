@@ -4,6 +4,9 @@ Create Accessible Field Mapping for PDF Modification
 
 This script creates a BEM mapping that includes only the fields that can actually
 be modified by PyPDFForm, using the enhanced field detection and normalization.
+
+Detection results are cached on disk; set PDF_ENRICHMENT_NO_CACHE=1 to disable
+the cache.
 """
 
 import json
@@ -13,19 +16,76 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector
+from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector, default_cache_dir
 from src.pdf_enrichment.utils import setup_logging
 
 
+def _write_json(path: Path, data: Dict) -> None:
+    """Write `data` as 2-space indented JSON, serializing with orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
+
+# Enhanced BEM naming patterns
+_BEM_PATTERNS = {
+    # Owner information
+    "FIRST_NAME": "owner-information_first-name",
+    "LAST_NAME": "owner-information_last-name", 
+    "FULL_NAME": "owner-information_full-name",
+    "CONTRACT_NUMBER": "owner-information_contract-number",
+    "ADDRESS": "owner-information_address",
+    "CITY": "owner-information_city",
+    "STATE": "owner-information_state",
+    "ZIP": "owner-information_zip",
+    "COUNTY": "owner-information_county",
+    "PHONE": "owner-information_phone",
+    "EMAIL": "owner-information_email",
+    "SSN": "owner-information_ssn",
+    "ADDR_SAME": "owner-information_address-same__checkbox",
+    
+    # Name change fields
+    "name-change--group": "name-change--group",
+    "name-change_reason--group": "name-change_reason--group", 
+    "NAME_CHANGE_FORMER_NAME": "name-change_former-name",
+    "NAME_CHANGE_NEW_NAME": "name-change_new-name",
+    
+    # Address change
+    "address-change--group": "address-change--group",
+    
+    # Dividend options - create individual fields
+    "CHANGE_DIVIDEND_OPTION": "dividend-option__accumulate-interest",
+    "DIVIDEND_OPTION_OTHER": "dividend-option_other-specify",
+    
+    # Billing and payments
+    "billing-frequency--group": "billing-frequency--group",
+    "stop-payments--group": "stop-payments--group",
+    "CHANGE_PREMIUM_PAYMENT": "premium-payments_change-request",
+    "PREMIUM_PAYMENT_AMOUNT": "premium-payments_amount",
+    
+    # Signatures
+    "SIGNATURE_FULL_NAME": "signatures_owner-name",
+    "SIGNATURE_DATE": "signatures_owner-date",
+    "Signature2": "signatures_owner-signature",
+    "Signature3": "signatures_joint-owner-signature",
+}
+
+
 def create_accessible_mapping(pdf_path: Path) -> Dict:
     """Create BEM mapping for only accessible (modifiable) fields."""
     
     # Setup enhanced field detection
-    detector = EnhancedFieldDetector()
+    detector = EnhancedFieldDetector(cache_dir=default_cache_dir())
     
     # Run field detection
     detection_result = detector.detect_all_fields(pdf_path)
@@ -44,67 +104,22 @@ def create_accessible_mapping(pdf_path: Path) -> Dict:
     field_details = []
     radio_groups = {}
     
-    # Enhanced BEM naming patterns
-    bem_patterns = {
-        # Owner information
-        "FIRST_NAME": "owner-information_first-name",
-        "LAST_NAME": "owner-information_last-name", 
-        "FULL_NAME": "owner-information_full-name",
-        "CONTRACT_NUMBER": "owner-information_contract-number",
-        "ADDRESS": "owner-information_address",
-        "CITY": "owner-information_city",
-        "STATE": "owner-information_state",
-        "ZIP": "owner-information_zip",
-        "COUNTY": "owner-information_county",
-        "PHONE": "owner-information_phone",
-        "EMAIL": "owner-information_email",
-        "SSN": "owner-information_ssn",
-        "ADDR_SAME": "owner-information_address-same__checkbox",
+    # Process accessible fields that are actually in PyPDFForm (modifiable)
+    for field_name in sorted(accessible_fields & pypdfform_fields):
+        bem_name = _BEM_PATTERNS.get(field_name, f"form_{field_name.lower().replace('_', '-')}")
+        bem_mappings[field_name] = bem_name
         
-        # Name change fields
-        "name-change--group": "name-change--group",
-        "name-change_reason--group": "name-change_reason--group", 
-        "NAME_CHANGE_FORMER_NAME": "name-change_former-name",
-        "NAME_CHANGE_NEW_NAME": "name-change_new-name",
-        
-        # Address change
-        "address-change--group": "address-change--group",
-        
-        # Dividend options - create individual fields
-        "CHANGE_DIVIDEND_OPTION": "dividend-option__accumulate-interest",
-        "DIVIDEND_OPTION_OTHER": "dividend-option_other-specify",
-        
-        # Billing and payments
-        "billing-frequency--group": "billing-frequency--group",
-        "stop-payments--group": "stop-payments--group",
-        "CHANGE_PREMIUM_PAYMENT": "premium-payments_change-request",
-        "PREMIUM_PAYMENT_AMOUNT": "premium-payments_amount",
-        
-        # Signatures
-        "SIGNATURE_FULL_NAME": "signatures_owner-name",
-        "SIGNATURE_DATE": "signatures_owner-date",
-        "Signature2": "signatures_owner-signature",
-        "Signature3": "signatures_joint-owner-signature",
-    }
-    
-    # Process accessible fields
-    for field_name in sorted(accessible_fields):
-        # Only include fields that are actually in PyPDFForm (modifiable)
-        if field_name in pypdfform_fields:
-            bem_name = bem_patterns.get(field_name, f"form_{field_name.lower().replace('_', '-')}")
-            bem_mappings[field_name] = bem_name
-            
-            # Create field detail
-            field_type = detection_result.field_types.get(field_name, "text")
-            field_detail = {
-                "original_name": field_name,
-                "bem_name": bem_name,
-                "field_type": field_type,
-                "section": bem_name.split('_')[0] if '_' in bem_name else bem_name.split('-')[0],
-                "confidence": "high",
-                "reasoning": f"Accessible field mapped to BEM name '{bem_name}'"
-            }
-            field_details.append(field_detail)
+        # Create field detail
+        field_type = detection_result.field_types.get(field_name, "text")
+        field_detail = {
+            "original_name": field_name,
+            "bem_name": bem_name,
+            "field_type": field_type,
+            "section": bem_name.split('_')[0] if '_' in bem_name else bem_name.split('-')[0],
+            "confidence": "high",
+            "reasoning": f"Accessible field mapped to BEM name '{bem_name}'"
+        }
+        field_details.append(field_detail)
     
     # Handle radio groups specifically
     group_fields = [f for f in bem_mappings.keys() if f.endswith("--group")]
@@ -172,8 +187,7 @@ def main():
     
     # Save mapping
     output_file = pdf_path.with_stem(f"{pdf_path.stem}_accessible_bem_mapping").with_suffix('.json')
-    with open(output_file, 'w') as f:
-        json.dump(mapping, f, indent=2)
+    _write_json(output_file, mapping)
     
     print(f"\n✅ Accessible mapping created: {output_file}")
     print(f"📋 Modifiable fields: {mapping['total_fields_mapped']}")
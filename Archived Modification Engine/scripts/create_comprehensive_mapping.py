@@ -4,78 +4,117 @@ Create Comprehensive BEM Field Mapping
 
 This script uses the enhanced field detection to create a complete BEM mapping
 for all detected fields, including normalized fields and proper field types.
+
+Detection results are cached on disk; set PDF_ENRICHMENT_NO_CACHE=1 to disable
+the cache.
 """
 
 import json
 import logging
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector
+from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector, default_cache_dir
 from src.pdf_enrichment.utils import setup_logging
 
 
+def _write_json(path: Path, data: Dict) -> None:
+    """Write `data` as 2-space indented JSON, serializing with orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
+
+# Substring replacements applied when normalizing element names. Longer keys
+# come first so the single-pass alternation prefers them at the same position.
+_ELEMENT_REPLACEMENTS = {
+    'signature-full-name': 'name',
+    'signature-date': 'date',
+    'addr': 'address',
+    'ssn': 'social-security-number',
+}
+_ELEMENT_REPLACEMENT_RE = re.compile("|".join(map(re.escape, _ELEMENT_REPLACEMENTS)))
+
+# Categories for fields without a prefix, tried in priority order against the
+# lowercased name; each alternative is a lookahead from the start of the name
+_UNPREFIXED_CATEGORY_RE = re.compile(
+    r"(?=.*name_change)(?P<name_change>)"
+    r"|(?=.*dividend)(?P<dividend>)"
+    r"|(?=.*(?:premium|payment))(?P<premium_payments>)"
+    r"|(?=.*billing)(?=.*frequency)(?P<billing_frequency>)"
+    r"|(?=.*stop)(?=.*payment)(?P<stop_payments>)",
+    re.DOTALL,
+)
+
+
 class ComprehensiveMappingGenerator:
     """Generate comprehensive BEM mappings for all detected fields."""
     
-    def __init__(self):
-        self.detector = EnhancedFieldDetector()
+    # BEM naming patterns for different field types (shared by all instances)
+    bem_patterns = {
+        # Owner information
+        "FIRST_NAME": "owner-information_first-name",
+        "LAST_NAME": "owner-information_last-name", 
+        "FULL_NAME": "owner-information_full-name",
+        "CONTRACT_NUMBER": "owner-information_contract-number",
+        "ADDRESS": "owner-information_address",
+        "CITY": "owner-information_city",
+        "STATE": "owner-information_state",
+        "ZIP": "owner-information_zip",
+        "COUNTY": "owner-information_county",
+        "PHONE": "owner-information_phone",
+        "EMAIL": "owner-information_email",
+        "SSN": "owner-information_ssn",
         
-        # BEM naming patterns for different field types
-        self.bem_patterns = {
-            # Owner information
-            "FIRST_NAME": "owner-information_first-name",
-            "LAST_NAME": "owner-information_last-name", 
-            "FULL_NAME": "owner-information_full-name",
-            "CONTRACT_NUMBER": "owner-information_contract-number",
-            "ADDRESS": "owner-information_address",
-            "CITY": "owner-information_city",
-            "STATE": "owner-information_state",
-            "ZIP": "owner-information_zip",
-            "COUNTY": "owner-information_county",
-            "PHONE": "owner-information_phone",
-            "EMAIL": "owner-information_email",
-            "SSN": "owner-information_ssn",
-            
-            # Insured information
-            "ADDR_SAME": "insured-information_address-same__checkbox",
-            
-            # Joint owner information patterns will use prefix-specific naming
-            
-            # Name change fields
-            "NAME_CHANGE_FORMER_NAME": "name-change_former-name",
-            "NAME_CHANGE_NEW_NAME": "name-change_new-name",
-            
-            # Dividend options
-            "CHANGE_DIVIDEND_OPTION": "dividend-option_change-request",
-            "DIVIDEND_OPTION_OTHER": "dividend-option_other-specify",
-            
-            # Premium payments
-            "CHANGE_PREMIUM_PAYMENT": "premium-payments_change-request",
-            "PREMIUM_PAYMENT_AMOUNT": "premium-payments_amount",
-            
-            # Signatures
-            "SIGNATURE_FULL_NAME": "signatures_owner-name",
-            "SIGNATURE_DATE": "signatures_owner-date",
-            "Signature2": "signatures_owner-signature",
-            "Signature3": "signatures_joint-owner-signature",
-        }
+        # Insured information
+        "ADDR_SAME": "insured-information_address-same__checkbox",
         
-        # Prefix-specific BEM blocks
-        self.prefix_bem_blocks = {
-            "OWNER.": "owner-information",
-            "PREMIUM_PAYOR.": "premium-payor",
-            "POLICY_OWNER.": "policy-owner",
-            "PRIMARY_INSURED.": "primary-insured",
-            "INSURED.": "insured-information",
-            "JOINT_OWNER.": "joint-owner",
-        }
+        # Joint owner information patterns will use prefix-specific naming
+        
+        # Name change fields
+        "NAME_CHANGE_FORMER_NAME": "name-change_former-name",
+        "NAME_CHANGE_NEW_NAME": "name-change_new-name",
+        
+        # Dividend options
+        "CHANGE_DIVIDEND_OPTION": "dividend-option_change-request",
+        "DIVIDEND_OPTION_OTHER": "dividend-option_other-specify",
+        
+        # Premium payments
+        "CHANGE_PREMIUM_PAYMENT": "premium-payments_change-request",
+        "PREMIUM_PAYMENT_AMOUNT": "premium-payments_amount",
+        
+        # Signatures
+        "SIGNATURE_FULL_NAME": "signatures_owner-name",
+        "SIGNATURE_DATE": "signatures_owner-date",
+        "Signature2": "signatures_owner-signature",
+        "Signature3": "signatures_joint-owner-signature",
+    }
+    
+    # Prefix-specific BEM blocks
+    prefix_bem_blocks = {
+        "OWNER.": "owner-information",
+        "PREMIUM_PAYOR.": "premium-payor",
+        "POLICY_OWNER.": "policy-owner",
+        "PRIMARY_INSURED.": "primary-insured",
+        "INSURED.": "insured-information",
+        "JOINT_OWNER.": "joint-owner",
+    }
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.detector = EnhancedFieldDetector(cache_dir=cache_dir)
     
     def generate_comprehensive_mapping(self, pdf_path: Path) -> Dict:
         """Generate comprehensive BEM mapping for all detected fields."""
@@ -88,7 +127,7 @@ class ComprehensiveMappingGenerator:
         radio_groups = {}
         
         # Process all detected fields
-        for field_name in sorted(detection_result.all_fields):
+        for field_name in detection_result.sorted_fields:
             bem_name = self._generate_bem_name(field_name, detection_result)
             bem_mappings[field_name] = bem_name
             
@@ -98,7 +137,7 @@ class ComprehensiveMappingGenerator:
                 "bem_name": bem_name,
                 "field_type": detection_result.field_types.get(field_name, "text"),
                 "accessible": field_name in detection_result.accessible_fields,
-                "sources": detection_result.field_sources.get(field_name, []),
+                "sources": sorted(detection_result.field_sources.get(field_name, ())),
                 "normalized": field_name in detection_result.field_prefixes,
                 "prefix": detection_result.field_prefixes.get(field_name, ""),
             }
@@ -110,25 +149,18 @@ class ComprehensiveMappingGenerator:
             field_details.append(field_detail)
         
         # Process radio groups
-        for group_name, options in detection_result.radio_groups.items():
-            if group_name in bem_mappings:
-                group_bem_name = bem_mappings[group_name]
-                option_names = []
-                
-                for option in options:
-                    if option in bem_mappings:
-                        option_bem = bem_mappings[option]
-                        # Extract option name from BEM name
-                        if '__' in option_bem:
-                            option_name = option_bem.split('__')[1]
-                        elif '_' in option_bem:
-                            parts = option_bem.split('_')
-                            option_name = parts[-1] if len(parts) > 1 else option_bem
-                        else:
-                            option_name = option_bem
-                        option_names.append(option_name)
-                
-                radio_groups[group_bem_name] = option_names
+        if detection_result.radio_groups:
+            # Extract each option name from its BEM name once, up front
+            option_name_of = {
+                bem_name: self._option_name(bem_name) for bem_name in bem_mappings.values()
+            }
+            for group_name, options in detection_result.radio_groups.items():
+                if group_name in bem_mappings:
+                    radio_groups[bem_mappings[group_name]] = [
+                        option_name_of[bem_mappings[option]]
+                        for option in options
+                        if option in bem_mappings
+                    ]
         
         # Create comprehensive mapping
         mapping = {
@@ -144,12 +176,21 @@ class ComprehensiveMappingGenerator:
             "detection_summary": detection_result.get_detection_summary(),
             "field_normalization": {
                 "normalized_count": len(detection_result.field_prefixes),
-                "prefixes_found": list(set(detection_result.field_prefixes.values())),
+                "prefixes_found": sorted({*detection_result.field_prefixes.values()}),
             }
         }
         
         return mapping
     
+    @staticmethod
+    def _option_name(bem_name: str) -> str:
+        """Extract the radio option name from a BEM name (modifier, else last element part)."""
+        if '__' in bem_name:
+            return bem_name.split('__', 2)[1]
+        if '_' in bem_name:
+            return bem_name.rpartition('_')[2]
+        return bem_name
+    
     def _generate_bem_name(self, field_name: str, detection_result) -> str:
         """Generate BEM name for a field based on its characteristics."""
         # Handle radio group containers
@@ -175,23 +216,17 @@ class ComprehensiveMappingGenerator:
             # Determine field type
             field_type = detection_result.field_types.get(field_name, "text")
             
-            # Generate BEM name
-            bem_name = f"{bem_block}_{element_name}"
-            
-            # Add modifier for specific field types
+            # Build the BEM name once for the field type
             if field_type == "checkbox":
-                bem_name += "__checkbox"
-            elif field_type == "signature":
+                return f"{bem_block}_{element_name}__checkbox"
+            if field_type == "signature":
                 # Special handling for signatures
                 if "signature" in element_name and "date" not in element_name and "name" not in element_name:
-                    bem_name = f"signatures_{bem_block.replace('-', '-')}-signature"
-                else:
-                    bem_name = f"signatures_{bem_block.replace('-', '-')}-{element_name}"
-            elif field_type == "date":
-                if "signature" in element_name:
-                    bem_name = f"signatures_{bem_block.replace('-', '-')}-date"
-            
-            return bem_name
+                    return f"signatures_{bem_block}-signature"
+                return f"signatures_{bem_block}-{element_name}"
+            if field_type == "date" and "signature" in element_name:
+                return f"signatures_{bem_block}-date"
+            return f"{bem_block}_{element_name}"
         
         # Handle fields without prefixes
         return self._generate_bem_name_without_prefix(field_name, detection_result)
@@ -200,32 +235,34 @@ class ComprehensiveMappingGenerator:
         """Generate BEM name for fields without prefixes."""
         field_type = detection_result.field_types.get(field_name, "text")
         field_lower = field_name.lower()
+        match = _UNPREFIXED_CATEGORY_RE.match(field_lower)
+        category = match.lastgroup if match else None
         
         # Name change fields
-        if "name_change" in field_lower or "NAME_CHANGE" in field_name:
+        if category == "name_change":
             element_name = self._normalize_element_name(field_name.replace("NAME_CHANGE_", ""))
             return f"name-change_{element_name}"
         
         # Dividend option fields
-        if "dividend" in field_lower or "DIVIDEND" in field_name:
+        if category == "dividend":
             if "other" in field_lower:
                 return "dividend-option_other-specify"
             else:
                 return "dividend-option_change-request"
         
         # Premium payment fields
-        if "premium" in field_lower or "payment" in field_lower:
+        if category == "premium_payments":
             if "amount" in field_lower:
                 return "premium-payments_amount"
             else:
                 return "premium-payments_change-request"
         
         # Billing frequency
-        if "billing" in field_lower and "frequency" in field_lower:
+        if category == "billing_frequency":
             return "billing-frequency--group"
         
         # Stop payments
-        if "stop" in field_lower and "payment" in field_lower:
+        if category == "stop_payments":
             return "stop-payments--group"
         
         # Signature fields
@@ -247,22 +284,10 @@ class ComprehensiveMappingGenerator:
         # Replace underscores with hyphens
         normalized = normalized.replace('_', '-')
         
-        # Handle special cases first
-        replacements = {
-            'addr': 'address',
-            'ssn': 'social-security-number',
-            'signature-full-name': 'name',
-            'signature-date': 'date',
-            'full-name': 'full-name',
-            'first-name': 'first-name',
-            'last-name': 'last-name',
-            'contract-number': 'contract-number',
-        }
-        
-        # Apply direct replacements
-        for old, new in replacements.items():
-            if old in normalized:
-                normalized = normalized.replace(old, new)
+        # Apply direct replacements in a single scan
+        normalized = _ELEMENT_REPLACEMENT_RE.sub(
+            lambda match: _ELEMENT_REPLACEMENTS[match.group()], normalized
+        )
         
         # Handle specific field patterns
         if normalized == 'full':
@@ -297,15 +322,14 @@ def main():
     setup_logging(level=logging.INFO)
     
     # Generate comprehensive mapping
-    generator = ComprehensiveMappingGenerator()
+    generator = ComprehensiveMappingGenerator(cache_dir=default_cache_dir())
     
     print(f"🔍 Analyzing PDF: {pdf_path}")
     mapping = generator.generate_comprehensive_mapping(pdf_path)
     
     # Save mapping
     output_file = pdf_path.with_stem(f"{pdf_path.stem}_comprehensive_bem_mapping").with_suffix('.json')
-    with open(output_file, 'w') as f:
-        json.dump(mapping, f, indent=2)
+    _write_json(output_file, mapping)
     
     print(f"✅ Comprehensive mapping created: {output_file}")
     print(f"📊 Fields analyzed: {mapping['total_fields_found']}")
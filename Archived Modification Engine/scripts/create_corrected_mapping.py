@@ -3,10 +3,27 @@
 Create corrected BEM mapping based on actual PDF field names
 """
 import json
+import re
+import sys
 from pathlib import Path
+from typing import Dict
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """Write `data` as 2-space indented JSON, serializing with orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
 
 # Actual PDF field names from the LIFE-1528-Q_BLANK.pdf
-actual_pdf_fields = [
+actual_pdf_fields = frozenset({
     "ADDRESS", "ADDR_SAME", "CHANGE_DIVIDEND_OPTION", "CHANGE_PREMIUM_PAYMENT",
     "CITY", "CONTRACT_NUMBER", "COUNTY", "DIVIDEND_OPTION_OTHER", "EMAIL",
     "FIRST_NAME", "FULL_NAME", "LAST_NAME", "NAME_CHANGE_FORMER_NAME",
@@ -14,14 +31,42 @@ actual_pdf_fields = [
     "SIGNATURE_FULL_NAME", "SSN", "STATE", "Signature2", "Signature3", "ZIP",
     "address-change--group", "billing-frequency--group", "name-change--group",
     "name-change_reason--group", "stop-payments--group"
-]
+})
+actual_field_count = len(actual_pdf_fields)
+
+# (BEM name substring, section) rules in priority order
+SECTION_RULES = (
+    ("owner-information", "owner_information"),
+    ("name-change", "name_change"),
+    ("address-change", "address_change"),
+    ("dividend-option", "dividend_options"),
+    ("billing-frequency", "billing_frequency"),
+    ("stop-payments", "stop_payments"),
+    ("premium-payments", "premium_payments"),
+    ("signatures", "signatures"),
+)
+# Every rule as one lookahead alternative from the start of the name, so a
+# single match() applies the rules in priority order and the (empty) named
+# group of the first matching rule reports the section
+_SECTION_RE = re.compile(
+    "|".join(f"(?=.*{re.escape(marker)})(?P<{label}>)" for marker, label in SECTION_RULES),
+    re.DOTALL,
+)
+# Field types for non-group fields in the same style: checkbox modifiers
+# (case-sensitive), signatures other than their name/date companions, dates
+_FIELD_TYPE_RE = re.compile(
+    r"(?=.*(?-i:__checkbox))(?P<checkbox>)"
+    r"|(?=.*signature)(?!.*(?:name|date))(?P<signature>)"
+    r"|(?=.*date)(?P<date>)",
+    re.IGNORECASE | re.DOTALL,
+)
 
 # Create corrected BEM mapping
 corrected_mapping = {
     "filename": "LIFE-1528-Q_BLANK.pdf",
     "analysis_timestamp": "2025-07-16T15:35:00Z",
-    "total_fields_found": len(actual_pdf_fields),
-    "total_fields_mapped": len(actual_pdf_fields),
+    "total_fields_found": actual_field_count,
+    "total_fields_mapped": actual_field_count,
     "form_context": "Nationwide Life Insurance Company service request form",
     "bem_mappings": {
         # Owner information
@@ -74,41 +119,24 @@ corrected_mapping = {
     "field_details": []
 }
 
+# Every actual PDF field must have exactly one mapping
+assert frozenset(corrected_mapping["bem_mappings"]) == actual_pdf_fields
+
 # Add field details
+add_field_detail = corrected_mapping["field_details"].append
 for original_name, bem_name in corrected_mapping["bem_mappings"].items():
     # Determine field type based on field name and BEM name
     if original_name.endswith("--group"):
         field_type = "radio_group"
-    elif "__checkbox" in bem_name:
-        field_type = "checkbox"
-    elif "signature" in bem_name.lower() and "name" not in bem_name.lower() and "date" not in bem_name.lower():
-        field_type = "signature"
-    elif "date" in bem_name.lower():
-        field_type = "date"
     else:
-        field_type = "text"
+        match = _FIELD_TYPE_RE.match(bem_name)
+        field_type = match.lastgroup if match else "text"
     
-    # Determine section
-    if "owner-information" in bem_name:
-        section = "owner_information"
-    elif "name-change" in bem_name:
-        section = "name_change"
-    elif "address-change" in bem_name:
-        section = "address_change"
-    elif "dividend-option" in bem_name:
-        section = "dividend_options"
-    elif "billing-frequency" in bem_name:
-        section = "billing_frequency"
-    elif "stop-payments" in bem_name:
-        section = "stop_payments"
-    elif "premium-payments" in bem_name:
-        section = "premium_payments"
-    elif "signatures" in bem_name:
-        section = "signatures"
-    else:
-        section = "other"
+    # Determine section from the first matching rule
+    match = _SECTION_RE.match(bem_name)
+    section = match.lastgroup if match else "other"
     
-    corrected_mapping["field_details"].append({
+    add_field_detail({
         "original_name": original_name,
         "bem_name": bem_name,
         "field_type": field_type,
@@ -119,11 +147,11 @@ for original_name, bem_name in corrected_mapping["bem_mappings"].items():
 
 # Save corrected mapping
 output_file = Path("/Users/wseke/Desktop/corrected_bem_mapping.json")
-with open(output_file, 'w') as f:
-    json.dump(corrected_mapping, f, indent=2)
+_write_json(output_file, corrected_mapping)
 
 print(f"Corrected BEM mapping saved to: {output_file}")
 print(f"Total fields mapped: {len(corrected_mapping['bem_mappings'])}")
 print("\nMapping summary:")
-for original, bem in sorted(corrected_mapping["bem_mappings"].items()):
-    print(f"  {original} → {bem}")
\ No newline at end of file
+sys.stdout.write("".join(
+    f"  {original} → {bem}\n" for original, bem in sorted(corrected_mapping["bem_mappings"].items())
+))
\ No newline at end of file
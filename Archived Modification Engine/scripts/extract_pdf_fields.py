@@ -2,9 +2,12 @@
 """
 Extract actual field names from PDF
 """
+import hashlib
 import json
+import os
 import sys
 from pathlib import Path
+from typing import List
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -12,6 +15,40 @@ sys.path.insert(0, str(project_root))
 
 from PyPDFForm import PdfWrapper
 
+# One cache file per resolved PDF path, so re-runs overwrite a single entry;
+# the stored mtime and size make edited files miss the cache
+_FIELD_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pdf_enrichment" / "fields"
+)
+
+
+def _load_field_names(pdf_file: Path) -> List[str]:
+    """Get the PyPDFForm widget names of a PDF, reusing the on-disk cache when valid."""
+    resolved = pdf_file.resolve()
+    stat = resolved.stat()
+    cache_file = _FIELD_CACHE_DIR / f"{hashlib.blake2b(str(resolved).encode()).hexdigest()}.json"
+    try:
+        cached = json.loads(cache_file.read_text())
+        field_names = cached["field_names"]
+        if (
+            cached["mtime_ns"] == stat.st_mtime_ns
+            and cached["size"] == stat.st_size
+            and isinstance(field_names, list)
+            and all(isinstance(name, str) for name in field_names)
+        ):
+            return field_names
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    field_names = list(PdfWrapper(str(pdf_file)).widgets.keys())
+    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "field_names": field_names}
+    try:
+        _FIELD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(entry))
+    except OSError:
+        pass  # caching is best-effort
+    return field_names
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: python extract_pdf_fields.py <pdf_file>")
@@ -23,11 +60,9 @@ def main():
         print(f"Error: PDF file not found: {pdf_file}")
         sys.exit(1)
     
-    # Load PDF
-    pdf = PdfWrapper(str(pdf_file))
-    
-    # Get field names and info
-    field_names = list(pdf.widgets.keys())
+    # Get field names (parses the PDF only on a cache miss), sorted once for
+    # both the listing and the JSON output
+    field_names = sorted(_load_field_names(pdf_file))
     
     print(f"PDF: {pdf_file}")
     print(f"Total fields: {len(field_names)}")
@@ -35,15 +70,14 @@ def main():
     
     # Print all field names
     print("Field names:")
-    for i, name in enumerate(sorted(field_names), 1):
-        print(f"{i:2d}. {name}")
+    sys.stdout.write("".join(f"{i:2d}. {name}\n" for i, name in enumerate(field_names, 1)))
     
     # Save to JSON
     output_file = pdf_file.with_suffix('.fields.json')
     field_data = {
         "pdf_file": str(pdf_file),
         "total_fields": len(field_names),
-        "field_names": sorted(field_names)
+        "field_names": field_names
     }
     
     with open(output_file, 'w') as f:
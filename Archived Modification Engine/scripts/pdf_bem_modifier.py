@@ -7,13 +7,20 @@ all properties. Saves the modified PDF with __parsed.pdf suffix.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import sys
 import tempfile
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -34,8 +41,9 @@ class PDFBEMModifier:
     def load_json_mappings(self, json_path: Path) -> Dict[str, str]:
         """Load BEM field mappings from JSON file."""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # orjson's JSONDecodeError subclasses json's, so one except arm covers both
+            payload = json_path.read_bytes()
+            data = orjson.loads(payload) if orjson is not None else json.loads(payload)
             
             # Extract bem_mappings from the JSON structure
             if 'bem_mappings' in data:
@@ -59,23 +67,24 @@ class PDFBEMModifier:
     
     def validate_pdf_file(self, pdf_path: Path) -> bool:
         """Validate that the PDF file exists and is readable."""
-        if not pdf_path.exists():
+        # Opening the file doubles as the existence check, so no separate stat
+        try:
+            with open(pdf_path, 'rb') as f:
+                # Read the first few bytes to check if it's a valid PDF
+                header = f.read(5)
+        except FileNotFoundError:
             logger.error(f"PDF file not found: {pdf_path}")
             return False
+        except Exception as e:
+            logger.error(f"Error reading PDF file {pdf_path}: {e}")
+            return False
         
         if not pdf_path.suffix.lower() == '.pdf':
             logger.error(f"File is not a PDF: {pdf_path}")
             return False
         
-        try:
-            with open(pdf_path, 'rb') as f:
-                # Try to read first few bytes to check if it's a valid PDF
-                header = f.read(8)
-                if not header.startswith(b'%PDF-'):
-                    logger.error(f"File does not appear to be a valid PDF: {pdf_path}")
-                    return False
-        except Exception as e:
-            logger.error(f"Error reading PDF file {pdf_path}: {e}")
+        if header != b'%PDF-':
+            logger.error(f"File does not appear to be a valid PDF: {pdf_path}")
             return False
         
         return True
@@ -118,12 +127,10 @@ class PDFBEMModifier:
                 logger.info(f"Field mappings to apply: {len(field_mappings)}")
                 
                 # Show first few mappings
-                for i, (original, bem_name) in enumerate(field_mappings.items()):
-                    if i < 5:
-                        logger.info(f"  {original} → {bem_name}")
-                    elif i == 5:
-                        logger.info(f"  ... and {len(field_mappings) - 5} more mappings")
-                        break
+                for original, bem_name in islice(field_mappings.items(), 5):
+                    logger.info(f"  {original} → {bem_name}")
+                if len(field_mappings) > 5:
+                    logger.info(f"  ... and {len(field_mappings) - 5} more mappings")
                 
                 logger.info("=== DRY RUN COMPLETE ===")
                 return True
@@ -132,13 +139,18 @@ class PDFBEMModifier:
             logger.info(f"Modifying PDF: {pdf_path}")
             logger.info(f"Applying {len(field_mappings)} field mappings")
             
-            modification_result = await self.pdf_modifier.modify_fields(
-                pdf_path=pdf_path,
-                field_mappings=field_mappings,
-                output_path=output_path,
-                preserve_original=True,
-                validate_mappings=True,
-                create_backup=False
+            # modify_fields never yields while it parses and rewrites the PDF, so
+            # run it on its own event loop in a worker thread to keep this loop free
+            modification_result = await asyncio.to_thread(
+                asyncio.run,
+                self.pdf_modifier.modify_fields(
+                    pdf_path=pdf_path,
+                    field_mappings=field_mappings,
+                    output_path=output_path,
+                    preserve_original=True,
+                    validate_mappings=True,
+                    create_backup=False
+                ),
             )
             
             if modification_result.success:
@@ -277,7 +289,6 @@ Examples:
     
     # Run the modification
     try:
-        import asyncio
         success = asyncio.run(modifier.modify_pdf(
             pdf_path=args.pdf,
             json_path=args.json,
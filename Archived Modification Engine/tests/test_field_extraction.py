@@ -6,7 +6,8 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-from src.pdf_enrichment.field_analyzer import FieldAnalyzer
+from src.pdf_enrichment.enhanced_field_detector import EnhancedFieldDetector, FieldDetectionResult
+from src.pdf_enrichment.field_analyzer import FieldAnalyzer, SmartFieldTypeDetector
 from src.pdf_enrichment.field_types import FieldType, FormField, FieldPosition
 
 
@@ -163,7 +164,109 @@ class TestFieldAnalyzer:
         for input_name, expected in test_cases:
             result = analyzer._clean_field_name(input_name)
             assert result == expected, f"Expected {input_name} -> {expected}, got {result}"
+    
+    def test_combine_type_signals_tie_break(self):
+        """Test tied signal scores resolve to the type whose signal came first."""
+        detector = SmartFieldTypeDetector()
+        
+        # DROPDOWN (0.7 * 0.8) and SIGNATURE (0.8 * 0.7) both score 0.56
+        result = detector._combine_type_signals(
+            (FieldType.TEXT_FIELD, 0.5),
+            (FieldType.CHECKBOX, 0.8),
+            (FieldType.DROPDOWN, 0.7),
+            (FieldType.SIGNATURE, 0.8),
+        )
+        assert result == FieldType.DROPDOWN
+    
+    def test_detect_radio_groups_by_position(self):
+        """Test radios without a naming pattern are grouped by their row."""
+        analyzer = FieldAnalyzer()
+        
+        form_fields = [
+            FormField(
+                id=index,
+                name=name,
+                field_type=FieldType.RADIO_BUTTON,
+                label=name,
+                position=FieldPosition(x=x, y=500, width=10, height=10, page=0),
+            )
+            for index, (name, x) in enumerate([("Yes", 100), ("No", 200)])
+        ]
+        
+        assert analyzer.detect_radio_groups(form_fields) == {"position_group_0": ["Yes", "No"]}
+
+
 
+class TestRadioGroupDetection:
+    """Test cases for radio group option detection."""
+    
+    @staticmethod
+    def _detect(field_names):
+        result = FieldDetectionResult()
+        result.add_fields(field_names, "pypdfform")
+        EnhancedFieldDetector()._detect_radio_groups(result)
+        return result.radio_groups
+    
+    def test_options_start_with_group_base(self):
+        """Options are the non-group fields starting with the group base, sorted."""
+        radio_groups = self._detect([
+            "billing-frequency--group",
+            "billing-frequency__quarterly",
+            "billing-frequency__annual",
+            "billing-frequency__semiannual",
+            "owner-information_billing-frequency",
+        ])
+        
+        assert radio_groups == {
+            "billing-frequency--group": [
+                "billing-frequency__annual",
+                "billing-frequency__quarterly",
+                "billing-frequency__semiannual",
+            ],
+        }
+    
+    def test_nested_groups_are_not_options(self):
+        """Other group containers are never collected as options."""
+        radio_groups = self._detect([
+            "name-change--group",
+            "name-change__owner",
+            "name-change_reason--group",
+            "name-change_reason__marriage",
+        ])
+        
+        assert radio_groups["name-change--group"] == [
+            "name-change__owner",
+            "name-change_reason__marriage",
+        ]
+        assert radio_groups["name-change_reason--group"] == ["name-change_reason__marriage"]
+    
+    def test_prefixed_fields_are_not_options_of_unprefixed_group(self):
+        """Dotted prefixed fields only belong to a group with the same prefix."""
+        radio_groups = self._detect([
+            "X--group",
+            "X_1",
+            "X_2",
+            "OWNER.X_1",
+            "OWNER.X--group",
+            "OWNER.X_2",
+        ])
+        
+        assert radio_groups == {
+            "X--group": ["X_1", "X_2"],
+            "OWNER.X--group": ["OWNER.X_1", "OWNER.X_2"],
+        }
+    
+    def test_group_without_options_is_omitted(self):
+        """A group container with no matching fields gets no radio group entry."""
+        radio_groups = self._detect(["address-change--group", "ADDRESS"])
+        
+        assert radio_groups == {}
+    
+    def test_dollar_sign_in_field_names(self):
+        """Field names containing '$' are collected like any other option."""
+        radio_groups = self._detect(["stop-payments--group", "stop-payments$", "$stop-payments"])
+        
+        assert radio_groups == {"stop-payments--group": ["stop-payments$"]}
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file